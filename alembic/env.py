@@ -2,14 +2,16 @@ from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
-from app.core.config import settings
+from app.core.config import get_settings
 from app.db.database import Base
+from app.db import models  # noqa: F401  (registers tables on Base.metadata)
 from alembic import context
 
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
+settings = get_settings()
 
 config.set_main_option(
     "sqlalchemy.url",
@@ -4,12 +4,13 @@ Revision ID: 1128275cb44f
 Revises: 
 Create Date: 2026-02-08 11:40:02.624332
 
+Kept so databases stamped at this revision still find their place in the
+history. Its original body only dropped the tables that
+Base.metadata.create_all recreated on the next app start; 861d4627c73d now
+creates whatever is missing, so this revision does nothing.
 """
 from typing import Sequence, Union
 
-from alembic import op
-import sqlalchemy as sa
-
 
 # revision identifiers, used by Alembic.
 revision: str = '1128275cb44f'
@@ -20,63 +21,9 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_index(op.f('ix_refresh_tokens_id'), table_name='refresh_tokens')
-    op.drop_index(op.f('ix_refresh_tokens_token'), table_name='refresh_tokens')
-    op.drop_table('refresh_tokens')
-    op.drop_index(op.f('ix_blacklisted_tokens_id'), table_name='blacklisted_tokens')
-    op.drop_index(op.f('ix_blacklisted_tokens_token'), table_name='blacklisted_tokens')
-    op.drop_table('blacklisted_tokens')
-    op.drop_index(op.f('ix_users_email'), table_name='users')
-    op.drop_index(op.f('ix_users_id'), table_name='users')
-    op.drop_index(op.f('ix_users_username'), table_name='users')
-    op.drop_table('users')
-    op.drop_index(op.f('ix_posts_id'), table_name='posts')
-    op.drop_index(op.f('ix_posts_title'), table_name='posts')
-    op.drop_table('posts')
-    # ### end Alembic commands ###
+    pass
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.create_table('posts',
-    sa.Column('id', sa.INTEGER(), nullable=False),
-    sa.Column('title', sa.VARCHAR(), nullable=True),
-    sa.Column('content', sa.VARCHAR(), nullable=True),
-    sa.Column('owner_id', sa.INTEGER(), nullable=True),
-    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_posts_title'), 'posts', ['title'], unique=False)
-    op.create_index(op.f('ix_posts_id'), 'posts', ['id'], unique=False)
-    op.create_table('users',
-    sa.Column('id', sa.INTEGER(), nullable=False),
-    sa.Column('username', sa.VARCHAR(), nullable=True),
-    sa.Column('email', sa.VARCHAR(), nullable=True),
-    sa.Column('hashed_password', sa.VARCHAR(), nullable=True),
-    sa.Column('role', sa.VARCHAR(), nullable=True),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=1)
-    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=1)
-    op.create_table('blacklisted_tokens',
-    sa.Column('id', sa.INTEGER(), nullable=False),
-    sa.Column('token', sa.VARCHAR(), nullable=True),
-    sa.Column('created_at', sa.DATETIME(), nullable=True),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_blacklisted_tokens_token'), 'blacklisted_tokens', ['token'], unique=1)
-    op.create_index(op.f('ix_blacklisted_tokens_id'), 'blacklisted_tokens', ['id'], unique=False)
-    op.create_table('refresh_tokens',
-    sa.Column('id', sa.INTEGER(), nullable=False),
-    sa.Column('token', sa.VARCHAR(), nullable=True),
-    sa.Column('user_id', sa.INTEGER(), nullable=True),
-    sa.Column('created_at', sa.DATETIME(), nullable=True),
-    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_refresh_tokens_token'), 'refresh_tokens', ['token'], unique=1)
-    op.create_index(op.f('ix_refresh_tokens_id'), 'refresh_tokens', ['id'], unique=False)
-    # ### end Alembic commands ###
+    pass
@@ -0,0 +1,44 @@
+"""move token blacklist to redis revocation store
+
+Revision ID: a3f9c1d27b64
+Revises: 568a00b8c7e0
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c1d27b64'
+down_revision: Union[str, Sequence[str], None] = '568a00b8c7e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drain blacklisted_tokens into the Redis revocation store, then drop it."""
+    from app.core.revocation import drain_blacklisted_tokens
+
+    # Fails (and leaves the table in place) if Redis is unreachable, so no
+    # revocation is lost
+    rows = op.get_bind().execute(sa.text("SELECT token FROM blacklisted_tokens"))
+    drain_blacklisted_tokens(row.token for row in rows)
+
+    op.drop_index(op.f('ix_blacklisted_tokens_token'), table_name='blacklisted_tokens')
+    op.drop_index(op.f('ix_blacklisted_tokens_id'), table_name='blacklisted_tokens')
+    op.drop_table('blacklisted_tokens')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('blacklisted_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_blacklisted_tokens_id'), 'blacklisted_tokens', ['id'], unique=False)
+    op.create_index(op.f('ix_blacklisted_tokens_token'), 'blacklisted_tokens', ['token'], unique=True)
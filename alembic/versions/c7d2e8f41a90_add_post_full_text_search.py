@@ -0,0 +1,79 @@
+"""add full-text search over posts
+
+Revision ID: c7d2e8f41a90
+Revises: a3f9c1d27b64
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e8f41a90'
+down_revision: Union[str, Sequence[str], None] = 'a3f9c1d27b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the app.db.search DDL as of this revision: later changes
+# to the live module must not change what this migration does
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, content, content='posts', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO posts_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS posts_fts_au",
+    "DROP TRIGGER IF EXISTS posts_fts_ad",
+    "DROP TRIGGER IF EXISTS posts_fts_ai",
+    "DROP TABLE IF EXISTS posts_fts",
+)
+
+POSTGRES_DDL = (
+    "CREATE INDEX IF NOT EXISTS ix_posts_search ON posts USING GIN ("
+    "to_tsvector('english', coalesce(posts.title, '') || ' ' || coalesce(posts.content, '')))",
+)
+
+POSTGRES_DROP = (
+    "DROP INDEX IF EXISTS ix_posts_search",
+)
+
+
+def upgrade() -> None:
+    """FTS5 table + sync triggers on SQLite, tsvector GIN index on Postgres."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        # Index the posts that already exist
+        op.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        for statement in POSTGRES_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DROP:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        for statement in POSTGRES_DROP:
+            op.execute(statement)
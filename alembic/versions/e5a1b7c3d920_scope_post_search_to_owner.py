@@ -0,0 +1,90 @@
+"""scope post full-text search to the owner
+
+Revision ID: e5a1b7c3d920
+Revises: c7d2e8f41a90
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1b7c3d920'
+down_revision: Union[str, Sequence[str], None] = 'c7d2e8f41a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# posts_fts and its triggers with owner_id (frozen copy of app.db.search)
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, content, owner_id, content='posts', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, content, owner_id) "
+    "VALUES (new.id, new.title, new.content, new.owner_id); END",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content, owner_id) "
+    "VALUES ('delete', old.id, old.title, old.content, old.owner_id); END",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content, owner_id) "
+    "VALUES ('delete', old.id, old.title, old.content, old.owner_id); "
+    "INSERT INTO posts_fts(rowid, title, content, owner_id) "
+    "VALUES (new.id, new.title, new.content, new.owner_id); END",
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS posts_fts_au",
+    "DROP TRIGGER IF EXISTS posts_fts_ad",
+    "DROP TRIGGER IF EXISTS posts_fts_ai",
+    "DROP TABLE IF EXISTS posts_fts",
+)
+
+# posts_fts and its triggers as c7d2e8f41a90 created them, without owner_id
+PREVIOUS_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, content, content='posts', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO posts_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+)
+
+
+def _recreate_sqlite_index(ddl):
+    for statement in SQLITE_DROP:
+        op.execute(statement)
+    for statement in ddl:
+        op.execute(statement)
+    op.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    """Rebuild posts_fts with an owner_id column on SQLite.
+
+    Postgres needs no schema change: the search query now filters on
+    owner_id next to the existing GIN index.
+    """
+    if op.get_bind().dialect.name == "sqlite":
+        _recreate_sqlite_index(SQLITE_DDL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        _recreate_sqlite_index(PREVIOUS_SQLITE_DDL)
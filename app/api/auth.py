@@ -1,14 +1,16 @@
+from datetime import timedelta
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
 from app.core.config import get_settings
 from app.core.response import success_response
-from app.core.security import create_access_token, decode_refresh_token
+from app.core.security import create_access_token, create_refresh_token, decode_refresh_token
+from app.core.revocation import token_id, claim, revoke_token
 from app.db.schemas import TokenResponse, LoginSchema
 from app.db import crud
-from app.db.blacklist import is_token_blacklisted, blacklist_token
 from app.services.auth_service import login_user
 from app.core.rate_limiter import rate_limiter
 
@@ -32,11 +34,12 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
     summary="Login user",
     description="Authenticates user and returns access + refresh tokens."
 )
-def login(
+async def login(
     data: LoginSchema,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _: None = Depends(rate_limiter)
 ):
-    tokens = login_user(db, data.email, data.password)
+    tokens = await login_user(db, data.email, data.password)
 
     return success_response(
         data=tokens,
@@ -53,21 +56,20 @@ def login(
     summary="Refresh access token",
     description="Generates new access token using valid refresh token."
 )
-def refresh_token(
+async def refresh_token(
     refresh_token: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    # 1️⃣ Check blacklist
-    if is_token_blacklisted(db, refresh_token):
+    # 1️⃣ Decode refresh token
+    try:
+        payload = decode_refresh_token(refresh_token)
+    except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token revoked",
+            detail="Invalid refresh token",
         )
 
-    # 2️⃣ Decode refresh token
-    try:
-        payload = decode_refresh_token(refresh_token)
-    except Exception:
+    if payload.get("type") != "refresh":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token",
@@ -80,26 +82,35 @@ def refresh_token(
             detail="Invalid token payload",
         )
 
-    # 3️⃣ Validate user
-    user = crud.get_user_by_id(db, user_id)
+    # 2️⃣ Validate user
+    user = await crud.get_user_by_id(db, user_id)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
 
-    # 4️⃣ Blacklist old refresh token
-    blacklist_token(db, refresh_token)
+    # 3️⃣ Revoke old refresh token (rotation). Check-and-revoke is one
+    # atomic claim: a replayed token loses even when both arrive at once
+    if not await claim(token_id(refresh_token, payload), payload["exp"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revoked",
+        )
 
-    # 5️⃣ Create new access token
+    # 4️⃣ Create new token pair
     access_token = create_access_token(
-        data={"sub": user.id}
+        data={"sub": str(user.id), "role": user.role}
+    )
+    new_refresh_token = create_refresh_token(
+        data={"sub": str(user.id)},
+        expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     )
 
     return success_response(
         data={
             "access_token": access_token,
-            "refresh_token": refresh_token,
+            "refresh_token": new_refresh_token,
             "token_type": "bearer"
         },
         message="Token refreshed successfully"
@@ -112,13 +123,12 @@ def refresh_token(
 @router.post(
     "/logout",
     summary="Logout user",
-    description="Blacklists the provided token."
+    description="Revokes the provided token until it expires."
 )
-def logout(
-    token: str,
-    db: Session = Depends(get_db)
+async def logout(
+    token: str
 ):
-    blacklist_token(db, token)
+    await revoke_token(token)
 
     return success_response(
         data=None,
@@ -134,7 +144,7 @@ def logout(
     summary="Get current user",
     description="Returns currently authenticated user details."
 )
-def get_me(
+async def get_me(
     current_user = Depends(get_current_user)
 ):
     return success_response(
@@ -144,11 +154,4 @@ def get_me(
             "role": current_user.role
         },
         message="User fetched successfully"
-    )
-
-
-@router.post("/login")
-def login(data: LoginSchema,
-          db: Session = Depends(get_db),
-          _: None = Depends(rate_limiter)):
-    return login_user(db, data.email, data.password)
\ No newline at end of file
+    )
\ No newline at end of file
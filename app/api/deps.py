@@ -1,46 +1,104 @@
-from fastapi import Depends, HTTPException, status
+import time
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from fastapi.security.utils import get_authorization_scheme_param
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db, AsyncSessionLocal, ReplicaSessionLocal
+from jose import JWTError
 from app.core.security import decode_access_token
-from app.db import models
-from app.core.redis import redis_client  # if using redis
+from app.core.revocation import token_id, is_revoked
+from app.db import crud
+from app.core.user_cache import user_cache
+from app.core.recent_writes import recent_writes
+from app.core.metrics import current_request_stats
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-def get_db():
-    db = SessionLocal()
+def _token_user_id(request: Request) -> int | None:
+    # Only used for routing; get_current_user does the real validation
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if scheme.lower() != "bearer" or not token:
+        return None
     try:
+        return int(decode_access_token(token)["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only routes. Goes to the replica, except for users who
+    wrote within READ_YOUR_WRITES_SECONDS: they read from the primary so
+    their own writes are visible despite replication lag.
+    """
+    if not recent_writes.enabled:
+        # No replica configured: skip decoding the token just to route
+        session_factory = AsyncSessionLocal
+    elif recent_writes.reads_from_primary(_token_user_id(request)):
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = ReplicaSessionLocal
+
+    async with session_factory() as db:
         yield db
-    finally:
-        db.close()
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    # Optional: Redis blacklist check
+    # Timed for the Server-Timing header (auth;dur=...)
+    started = time.perf_counter_ns()
     try:
-        if redis_client.exists(token):
+        return await _authenticate(token, db)
+    finally:
+        stats = current_request_stats()
+        if stats is not None:
+            stats.auth_time_ns += time.perf_counter_ns() - started
+
+
+async def _authenticate(token: str, db: AsyncSession):
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=401,
+            detail="Could not validate credentials"
+        )
+
+    # Revocation check (fails open if redis is not running)
+    if await is_revoked(token_id(token, payload)):
+        raise HTTPException(
+            status_code=401,
+            detail="Token has been revoked"
+        )
+
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid token payload"
+        )
+
+    user = user_cache.get(int(user_id))
+    if user is None:
+        db_user = await crud.get_user_by_id(db, user_id)
+
+        if not db_user:
             raise HTTPException(
-                status_code=401,
-                detail="Token has been revoked"
+                status_code=404,
+                detail="User not found"
             )
-    except Exception:
-        pass  # ignore if redis not running
-
-    payload = decode_access_token(token)
 
-    user = db.query(models.User).filter(
-        models.User.id == payload.get("user_id")
-    ).first()
+        user = user_cache.set(db_user)
 
-    if not user:
+    # Deactivated accounts may still hold unexpired access tokens
+    if not user.is_active:
         raise HTTPException(
-            status_code=404,
-            detail="User not found"
+            status_code=401,
+            detail="Inactive user"
         )
 
     return user
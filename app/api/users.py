@@ -1,11 +1,20 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db import crud
 from app.db.database import get_db
-from app.db.schemas import UserCreate, UserOut
+from app.db.schemas import UserCreate, UserOut, UserRoleUpdate
+from app.core.exceptions import NotFoundException
 from app.core.permissions import require_role
 from app.services.user_service import register_user
 from app.core.response import success_response
+from app.core.user_cache import user_cache
+from app.core.security import token_cache
+from app.core.revocation import revoked_filter
+from app.core.redis import redis_breaker
+from app.core.recent_writes import recent_writes
+from app.core.post_list_cache import post_list_cache
+from app.core.query_profiler import query_profiler
 from app.db.schemas import AdminDashboardResponse
 
 
@@ -24,9 +33,9 @@ router = APIRouter(
     summary="Register a new user",
     description="Creates a new user account with default role 'user'.",
 )
-def register(
+async def register(
     user: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Registers a new user.
@@ -36,7 +45,7 @@ def register(
     - Stores user in database
     """
 
-    created_user = register_user(db, user)
+    created_user = await register_user(db, user)
 
     return success_response(
         data={
@@ -57,7 +66,7 @@ def register(
     summary="Admin Dashboard",
     description="Accessible only to users with admin role."
 )
-def admin_dashboard(
+async def admin_dashboard(
     current_user = Depends(require_role("admin"))
 ):
     return success_response(
@@ -66,4 +75,57 @@ def admin_dashboard(
             "role": current_user.role
         },
         message="Welcome Admin"
+    )
+
+
+# -------------------------
+# Change User Role
+# -------------------------
+@router.patch(
+    "/admin/{user_id}/role",
+    summary="Change a user's role",
+    description="Admin only. Applies on every worker at once: the user's cached row is invalidated."
+)
+async def change_user_role(
+    user_id: int,
+    payload: UserRoleUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(require_role("admin"))
+):
+    user = await crud.update_user_role(db, user_id, payload.role)
+    if user is None:
+        raise NotFoundException(detail="User not found")
+
+    return success_response(
+        data={
+            "id": user.id,
+            "email": user.email,
+            "role": user.role
+        },
+        message="User role updated"
+    )
+
+
+# -------------------------
+# User Cache Stats
+# -------------------------
+@router.get(
+    "/admin/cache-stats",
+    summary="User cache stats",
+    description="Hit/miss counters of this worker's in-process user/token caches and revocation filter."
+)
+async def user_cache_stats(
+    current_user = Depends(require_role("admin"))
+):
+    return success_response(
+        data={
+            "user_cache": user_cache.stats(),
+            "token_cache": token_cache.stats(),
+            "revocation_filter": revoked_filter.stats(),
+            "redis_breaker": redis_breaker.stats(),
+            "read_routing": recent_writes.stats(),
+            "post_list_cache": post_list_cache.stats(),
+            "query_profiler": query_profiler.stats()
+        },
+        message="User cache stats"
     )
\ No newline at end of file
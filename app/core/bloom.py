@@ -0,0 +1,219 @@
+import hashlib
+import math
+import threading
+import time
+
+from app.core.metrics import (
+    revocation_filter_ready,
+    revocation_filter_round_trips_saved,
+    revocation_filter_false_positives,
+    revocation_filter_false_positive_rate,
+)
+from app.core.redis import redis_client
+from app.core.pubsub import ChannelListener
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter: no false negatives, tunable false positives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # Kirsch-Mitzenmacher double hashing over one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevokedTokenFilter:
+    """
+    In-process pre-check for the Redis revocation store.
+
+    Revoked token ids go into one Bloom filter per expiry bucket; a bucket
+    is dropped once every token in it has expired, so the false-positive
+    rate does not creep up over time. A miss is a definite "not revoked"
+    and skips the Redis round-trip; a hit is confirmed against Redis.
+
+    Filters are rebuilt from Redis whenever the listener (re)subscribes
+    and kept in sync across workers through the REVOKED_CHANNEL pub/sub
+    channel. Until a rebuild has succeeded the filter reports
+    `ready = False` and every check goes to Redis; if Redis is down the
+    listener keeps retrying in the background.
+    """
+
+    def __init__(self, key_prefix: str, channel: str, capacity: int,
+                 error_rate: float, bucket_seconds: int):
+        self.key_prefix = key_prefix
+        self.channel = channel
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bucket_seconds = bucket_seconds
+        self._ready = False
+
+        self.checks = 0
+        self.round_trips_saved = 0
+        self.confirmed_revoked = 0
+        self.false_positives = 0
+
+        self._buckets: dict[int, BloomFilter] = {}
+        self._pending: list | None = None
+        self._lock = threading.Lock()
+        # Subscribed before every rebuild so no revocation falls in between
+        self._listener = ChannelListener(
+            "Revocation filter", channel, self._on_message,
+            on_subscribed=self.rebuild,
+            on_error=self._on_listener_error,
+        )
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    @ready.setter
+    def ready(self, value: bool):
+        self._ready = value
+        revocation_filter_ready.set(1 if value else 0)
+
+    # -------------------------
+    # Filter maintenance
+    # -------------------------
+    def _add_local(self, buckets: dict, jti: str, exp: float):
+        bucket = int(exp // self.bucket_seconds)
+        bloom = buckets.get(bucket)
+        if bloom is None:
+            bloom = buckets[bucket] = BloomFilter(self.capacity, self.error_rate)
+        bloom.add(jti)
+
+    def add(self, jti: str, exp: float):
+        with self._lock:
+            self._add_local(self._buckets, jti, exp)
+            if self._pending is not None:
+                self._pending.append((jti, exp))
+
+    def _expire_buckets(self):
+        current = int(time.time() // self.bucket_seconds)
+        with self._lock:
+            for bucket in [b for b in self._buckets if b < current]:
+                del self._buckets[bucket]
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """False means definitely not revoked; True means ask Redis."""
+        self.checks += 1
+        if not self.ready:
+            return True
+
+        self._expire_buckets()
+        if any(jti in bloom for bloom in list(self._buckets.values())):
+            return True
+
+        self.round_trips_saved += 1
+        revocation_filter_round_trips_saved.inc()
+        self._observe_false_positive_rate()
+        return False
+
+    def record_result(self, revoked: bool):
+        # Outcome of a Redis lookup that followed a Bloom hit
+        if not self.ready:
+            return
+        if revoked:
+            self.confirmed_revoked += 1
+        else:
+            self.false_positives += 1
+            revocation_filter_false_positives.inc()
+            self._observe_false_positive_rate()
+
+    def false_positive_rate(self) -> float:
+        # False positives as a share of all checks for non-revoked tokens
+        negatives = self.round_trips_saved + self.false_positives
+        return self.false_positives / negatives if negatives else 0.0
+
+    def _observe_false_positive_rate(self):
+        revocation_filter_false_positive_rate.set(self.false_positive_rate())
+
+    def rebuild(self):
+        # Raises on a Redis error; the listener then retries with backoff
+        with self._lock:
+            self._pending = []
+
+        try:
+            buckets: dict[int, BloomFilter] = {}
+            now = time.time()
+            prefix_len = len(self.key_prefix)
+            batch = []
+
+            def flush():
+                pipe = redis_client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.ttl(key)
+                for key, ttl in zip(batch, pipe.execute()):
+                    if ttl and ttl > 0:
+                        self._add_local(buckets, key[prefix_len:], now + ttl)
+                batch.clear()
+
+            for key in redis_client.scan_iter(match=f"{self.key_prefix}*", count=1000):
+                batch.append(key)
+                if len(batch) >= 1000:
+                    flush()
+            if batch:
+                flush()
+
+            with self._lock:
+                # Revocations that arrived while scanning
+                for jti, exp in self._pending:
+                    self._add_local(buckets, jti, exp)
+                self._buckets = buckets
+                self.ready = True
+        finally:
+            with self._lock:
+                self._pending = None
+
+    # -------------------------
+    # Cross-worker sync
+    # -------------------------
+    @staticmethod
+    def message(jti: str, exp: float) -> str:
+        # Payload published on self.channel for each revocation
+        return f"{jti}:{int(exp)}"
+
+    def _on_message(self, message):
+        try:
+            jti, exp = message["data"].rsplit(":", 1)
+            self.add(jti, float(exp))
+        except (AttributeError, ValueError):
+            pass
+
+    def _on_listener_error(self):
+        # Messages may have been missed: stop trusting the filter until it
+        # has been rebuilt from Redis
+        self.ready = False
+
+    def start(self):
+        # Non-blocking; the first rebuild runs on the listener thread
+        self._listener.start()
+
+    def stop(self):
+        self._listener.stop()
+        self.ready = False
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "buckets": len(self._buckets),
+            "checks": self.checks,
+            "round_trips_saved": self.round_trips_saved,
+            "confirmed_revoked": self.confirmed_revoked,
+            "false_positives": self.false_positives,
+            "false_positive_rate": round(self.false_positive_rate(), 6),
+        }
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from app.core.exceptions import ServiceUnavailableException
+from app.core.logger import logger
+from app.core.metrics import (
+    BREAKER_STATE_VALUES,
+    circuit_breaker_state,
+    circuit_breaker_opened,
+    circuit_breaker_short_circuited,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Errors that mean "the dependency is down or slow", as opposed to a bad
+# command, which should surface normally
+TRIP_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError, asyncio.TimeoutError)
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Closed: calls go through; `failure_threshold` consecutive failures open
+    the circuit. Open: calls fail immediately with CircuitOpenError for
+    `cooldown_seconds`. Half-open: a single probe call is let through;
+    success closes the circuit, failure opens it again.
+
+    Each call site passes its own `fallback`, called with the error instead
+    of raising it, e.g. fail_open(False) or fail_closed("rate limiter").
+    """
+
+    def __init__(self, name: str, failure_threshold: int, cooldown_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.short_circuited = 0
+        self._probe_in_flight = False
+
+        # Exported on /metrics, see app/core/metrics.py
+        self._state_gauge = circuit_breaker_state.labels(name)
+        self._opened_counter = circuit_breaker_opened.labels(name)
+        self._short_circuited_counter = circuit_breaker_short_circuited.labels(name)
+        self._set_state(CLOSED)
+
+    def _set_state(self, state: str):
+        self.state = state
+        self._state_gauge.set(BREAKER_STATE_VALUES[state])
+
+    def _short_circuit(self, reason: str):
+        self.short_circuited += 1
+        self._short_circuited_counter.inc()
+        raise CircuitOpenError(f"{self.name} circuit is {reason}")
+
+    def _before_call(self):
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown_seconds:
+                self._short_circuit("open")
+            self._set_state(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self._short_circuit("half-open")
+            self._probe_in_flight = True
+
+    def _on_success(self):
+        self._probe_in_flight = False
+        self.failures = 0
+        if self.state != CLOSED:
+            logger.info(f"{self.name} circuit closed")
+            self._set_state(CLOSED)
+
+    def _on_failure(self):
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+                self._opened_counter.inc()
+                logger.warning(f"{self.name} circuit opened after {self.failures} failures")
+            self._set_state(OPEN)
+            self.opened_at = time.monotonic()
+
+    def retry_after(self) -> int:
+        remaining = self.cooldown_seconds - (time.monotonic() - self.opened_at)
+        return max(1, int(remaining + 0.999))
+
+    async def call(self, fn, *args, fallback=None, **kwargs):
+        try:
+            self._before_call()
+        except CircuitOpenError as exc:
+            if fallback is None:
+                raise
+            return fallback(exc)
+
+        try:
+            result = await fn(*args, **kwargs)
+        except TRIP_ERRORS as exc:
+            self._on_failure()
+            if fallback is None:
+                raise
+            return fallback(exc)
+        except BaseException:
+            # Not an availability problem, but release a half-open probe
+            self._probe_in_flight = False
+            raise
+
+        self._on_success()
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "short_circuited_calls": self.short_circuited,
+        }
+
+
+# -------------------------
+# Fallback policies
+# -------------------------
+def fail_open(default, what: str = "call"):
+    def fallback(exc):
+        if not isinstance(exc, CircuitOpenError):
+            logger.warning(f"{what} skipped, redis unavailable: {exc}")
+        return default
+    return fallback
+
+
+def fail_closed(what: str, breaker: CircuitBreaker):
+    def fallback(exc):
+        raise ServiceUnavailableException(
+            detail=f"{what} temporarily unavailable",
+            retry_after=breaker.retry_after() if breaker.state == OPEN else 1
+        )
+    return fallback
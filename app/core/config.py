@@ -5,12 +5,99 @@ class Settings(BaseSettings):
     APP_NAME:str="FastAPI Backend"
     DEBUG:bool=False
 
+    # Logs are written by a background thread (see app/core/logger.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    LOG_QUEUE_SIZE: int = 10_000
+    # Share of successful (< 400) request logs kept; errors are always logged
+    LOG_SUCCESS_SAMPLE_RATE: float = 1.0
+
+    # Responses smaller than this (bytes) are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = 1000
+    # Server-Timing header with db / redis / auth / app durations
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Share of requests whose SQL statements are recorded and checked for
+    # N+1 patterns (app/core/query_profiler.py); 1.0 in development
+    QUERY_PROFILER_SAMPLE_RATE: float = 0.0
+    # Executions of one statement in a request that flag it as N+1
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5
+
     SECRET_KEY: str
+    # HS256 signs with SECRET_KEY via python-jose; EdDSA / ES256 sign with
+    # the key pairs in JWT_KEY_DIR (see app/core/jwt_backends.py)
     ALGORITHM: str
+    JWT_KEY_DIR: str = "keys"
+    JWT_ACTIVE_KID: str | None = None
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
     DATABASE_URL: str
+    # Optional read replica for GET routes; reads go to the primary for
+    # READ_YOUR_WRITES_SECONDS after a user's own write
+    DATABASE_REPLICA_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Connection pool (Postgres; file-backed SQLite uses the sizing only)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_TIMEOUT_MS: int = 5000  # 0 disables
+    # Pragmas applied to every SQLite connection
+    SQLITE_JOURNAL_MODE: str = "wal"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # Worker startup (app/db/warmup.py): DB and Redis connections opened
+    # before the first request; tables are created only when enabled
+    # (development; deployments run `alembic upgrade head`)
+    STARTUP_WARM_CONNECTIONS: int = 2
+    DB_CREATE_TABLES_ON_STARTUP: bool = False
     REDIS_URL:str
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_CONNECT_TIMEOUT: float = 0.5
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    # Circuit breaker around request-path Redis calls
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 5
+    REDIS_BREAKER_COOLDOWN_SECONDS: float = 5.0
+
+    # In-process cache of user rows used by get_current_user
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 30.0
+
+    # Password hashing profile. Stored hashes using another scheme or other
+    # cost parameters are rehashed transparently on the next login.
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # "bcrypt" or "argon2"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_TIME_COST: int = 3
+    ARGON2_PARALLELISM: int = 4
+
+    # Bloom filter pre-check in front of the Redis revocation store; one
+    # filter per bucket of token expiry times
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    REVOCATION_BLOOM_BUCKET_SECONDS: int = 86_400
+
+    # Local token-bucket tier of the rate limiter (0 disables leasing)
+    RATE_LIMIT_LEASE_SIZE: int = 5
+    RATE_LIMIT_MAX_OVERSHOOT: int = 5
+    RATE_LIMIT_LEASE_TTL_SECONDS: float = 1.0
+
+    # Process pool for bcrypt hashing/verification
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Redis cache of /posts/me pages (invalidated on every post write);
+    # entries never outlive READ_YOUR_WRITES_SECONDS
+    POSTS_CACHE_TTL_SECONDS: int = 300
+
+    # Max posts per POST/DELETE /posts/bulk request
+    POST_BULK_MAX_ITEMS: int = 500
+
+    # Verified-claims cache used by decode_access_token/decode_refresh_token
+    TOKEN_CACHE_MAX_SIZE: int = 50_000
     
     model_config = SettingsConfigDict(
         env_file=".env"
@@ -7,4 +7,13 @@ class NotFoundException(HTTPException):
 
 class UnauthorizedException(HTTPException):
     def __init__(self, detail="Unauthorized"):
-        super().__init__(status_code=401, detail=detail)
\ No newline at end of file
+        super().__init__(status_code=401, detail=detail)
+
+
+class ServiceUnavailableException(HTTPException):
+    def __init__(self, detail="Service temporarily unavailable", retry_after=1):
+        super().__init__(
+            status_code=503,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
\ No newline at end of file
@@ -0,0 +1,213 @@
+import base64
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from jose import jwt
+from jose.exceptions import JWTError, ExpiredSignatureError
+
+from app.core.config import get_settings
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class TokenBackend(ABC):
+    """
+    Signs and verifies JWTs.
+
+    Every backend raises jose's JWTError (or ExpiredSignatureError) on a bad
+    token so callers keep a single exception type to handle.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def encode(self, claims: dict) -> str:
+        ...
+
+    @abstractmethod
+    def decode(self, token: str) -> dict:
+        ...
+
+
+# -------------------------
+# python-jose (HS256 / shared secret)
+# -------------------------
+class JoseBackend(TokenBackend):
+    def __init__(self, secret_key: str, algorithm: str):
+        self.name = f"jose-{algorithm}"
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def encode(self, claims: dict) -> str:
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+
+
+# -------------------------
+# cryptography (EdDSA / ES256, asymmetric with kid rotation)
+# -------------------------
+class AsymmetricBackend(TokenBackend):
+    """
+    JWS compact serialization signed with Ed25519 (EdDSA) or P-256 (ES256).
+
+    `private_keys` is only needed where tokens are issued; services that just
+    verify hold the public keys. Each token carries the `kid` of its signing
+    key, so rotating means adding a new key pair, pointing `active_kid` at
+    it and dropping the old public key once its last token has expired.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        public_keys: dict,
+        private_keys: dict | None = None,
+        active_kid: str | None = None,
+    ):
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        if algorithm not in ("EdDSA", "ES256"):
+            raise ValueError(f"Unsupported algorithm: {algorithm}")
+
+        self.name = f"cryptography-{algorithm}"
+        self.algorithm = algorithm
+        self.public_keys = dict(public_keys)
+        self.private_keys = dict(private_keys or {})
+        self.active_kid = active_kid
+        self._ecdsa = ec.ECDSA(hashes.SHA256())
+
+        # A private key can always verify its own tokens
+        for kid, key in self.private_keys.items():
+            self.public_keys.setdefault(kid, key.public_key())
+
+    def _sign(self, key, data: bytes) -> bytes:
+        if self.algorithm == "EdDSA":
+            return key.sign(data)
+
+        from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+        r, s = decode_dss_signature(key.sign(data, self._ecdsa))
+        return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+
+    def _verify(self, key, signature: bytes, data: bytes):
+        if self.algorithm == "EdDSA":
+            key.verify(signature, data)
+            return
+
+        from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+        if len(signature) != 64:
+            raise JWTError("Signature verification failed.")
+        r = int.from_bytes(signature[:32], "big")
+        s = int.from_bytes(signature[32:], "big")
+        key.verify(encode_dss_signature(r, s), data, self._ecdsa)
+
+    def encode(self, claims: dict) -> str:
+        key = self.private_keys.get(self.active_kid)
+        if key is None:
+            raise JWTError("No active signing key configured")
+
+        header = {"alg": self.algorithm, "typ": "JWT", "kid": self.active_kid}
+        signing_input = (
+            _b64encode(json.dumps(header, separators=(",", ":")).encode())
+            + "."
+            + _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        )
+        signature = self._sign(key, signing_input.encode())
+        return f"{signing_input}.{_b64encode(signature)}"
+
+    def decode(self, token: str) -> dict:
+        from cryptography.exceptions import InvalidSignature
+
+        try:
+            header_b64, payload_b64, signature_b64 = token.split(".")
+            header = json.loads(_b64decode(header_b64))
+            signature = _b64decode(signature_b64)
+        except (ValueError, TypeError):
+            raise JWTError("Invalid token")
+
+        # Anything a forged token can put here must end up as a JWTError (401)
+        if not isinstance(header, dict):
+            raise JWTError("Invalid header")
+
+        if header.get("alg") != self.algorithm:
+            raise JWTError("The specified alg value is not allowed")
+
+        kid = header.get("kid")
+        key = self.public_keys.get(kid) if isinstance(kid, str) else None
+        if key is None:
+            raise JWTError("Unknown key id")
+
+        try:
+            self._verify(key, signature, f"{header_b64}.{payload_b64}".encode())
+        except InvalidSignature:
+            raise JWTError("Signature verification failed.")
+
+        try:
+            claims = json.loads(_b64decode(payload_b64))
+        except ValueError:
+            raise JWTError("Invalid payload")
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload")
+
+        exp = claims.get("exp")
+        if exp is not None and (isinstance(exp, bool) or not isinstance(exp, (int, float))):
+            raise JWTError("Invalid exp claim")
+        if exp is not None and exp <= time.time():
+            raise ExpiredSignatureError("Signature has expired.")
+
+        return claims
+
+
+def load_keys(key_dir: str):
+    """
+    Reads `<kid>.pem` (private) and `<kid>.pub.pem` (public) files from
+    `key_dir`. Generate a pair with e.g.
+
+        openssl genpkey -algorithm ed25519 -out keys/2026-01.pem
+        openssl pkey -in keys/2026-01.pem -pubout -out keys/2026-01.pub.pem
+    """
+    from cryptography.hazmat.primitives.serialization import (
+        load_pem_private_key,
+        load_pem_public_key,
+    )
+
+    private_keys, public_keys = {}, {}
+
+    for filename in sorted(os.listdir(key_dir)):
+        path = os.path.join(key_dir, filename)
+        with open(path, "rb") as f:
+            data = f.read()
+        if filename.endswith(".pub.pem"):
+            public_keys[filename[:-len(".pub.pem")]] = load_pem_public_key(data)
+        elif filename.endswith(".pem"):
+            private_keys[filename[:-len(".pem")]] = load_pem_private_key(data, password=None)
+
+    return private_keys, public_keys
+
+
+@lru_cache
+def get_token_backend() -> TokenBackend:
+    settings = get_settings()
+
+    if settings.ALGORITHM in ("EdDSA", "ES256"):
+        private_keys, public_keys = load_keys(settings.JWT_KEY_DIR)
+        return AsymmetricBackend(
+            algorithm=settings.ALGORITHM,
+            public_keys=public_keys,
+            private_keys=private_keys,
+            active_kid=settings.JWT_ACTIVE_KID,
+        )
+
+    return JoseBackend(settings.SECRET_KEY, settings.ALGORITHM)
@@ -1,12 +1,152 @@
+import atexit
 import logging
+import queue
+import random
+import sys
+import time
+import traceback
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 
-def setup_logger():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    )
+import orjson
 
-    return logging.getLogger("fastapi_app")
+from app.core.config import get_settings
 
+settings = get_settings()
 
-logger = setup_logger()
\ No newline at end of file
+# Set per request by RequestIdMiddleware (app/core/middleware.py); copied onto every
+# record logged while handling that request
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+# -------------------------
+# Formatters (run on the listener thread)
+# -------------------------
+def _timestamp(record: logging.LogRecord) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; `extra={"fields": {...}}` adds keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": _timestamp(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = "".join(traceback.format_exception(*record.exc_info))
+        return orjson.dumps(entry, default=str).decode()
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{_timestamp(record)} | {record.levelname} | {record.name} | "
+        if getattr(record, "request_id", None):
+            line += f"{record.request_id} | "
+        line += record.getMessage()
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " | " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + "".join(traceback.format_exception(*record.exc_info))
+        return line
+
+
+# -------------------------
+# Caller side (runs on the event loop)
+# -------------------------
+class RequestContextFilter(logging.Filter):
+    # Context variables do not reach the listener thread: capture them here
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without formatting them.
+
+    The stock QueueHandler formats the message and traceback on the
+    calling thread; here the record is queued as it is, args included, and
+    the listener does all of the formatting. Arguments mutated after the
+    log call may show their later value. When the queue is full (the sink
+    has stalled) records are dropped and counted rather than blocking the
+    request.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, max_size: int):
+        super().__init__(log_queue)
+        self.max_size = max_size
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process, nothing to pickle: no getMessage() here
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # SimpleQueue is lock-free on put but unbounded: bound it here
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+def should_log_request(status_code: int) -> bool:
+    # Errors are always logged; successful requests are sampled
+    if status_code >= 400:
+        return True
+    rate = settings.LOG_SUCCESS_SAMPLE_RATE
+    return rate >= 1.0 or random.random() < rate
+
+
+def _stop_listener(listener: QueueListener):
+    # QueueListener.stop() fails on a listener that was already stopped
+    if listener._thread is not None:
+        listener.stop()
+
+
+def setup_logger(
+    level: str = "INFO",
+    fmt: str = "json",
+    queue_size: int = 10_000,
+    stream=None,
+):
+    """
+    Routes every logger through a bounded queue to a single background
+    thread that formats and writes the records. Returns (handler, listener).
+    """
+    sink = logging.StreamHandler(stream or sys.stdout)
+    sink.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    handler = NonBlockingQueueHandler(queue.SimpleQueue(), max_size=queue_size)
+    handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    listener = QueueListener(handler.queue, sink)
+    listener.start()
+    # Flush whatever is still queued when the worker exits
+    atexit.register(_stop_listener, listener)
+
+    return handler, listener
+
+
+log_handler, log_listener = setup_logger(
+    level=settings.LOG_LEVEL,
+    fmt=settings.LOG_FORMAT,
+    queue_size=settings.LOG_QUEUE_SIZE,
+)
+
+logger = logging.getLogger("fastapi_app")
@@ -0,0 +1,203 @@
+"""
+Prometheus metrics for requests, SQL queries and Redis calls, circuit
+breakers and the revocation Bloom filter.
+
+Every gunicorn worker records into its own registry; when
+PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py) the values live in
+mmap'd files in that directory and GET /metrics aggregates all workers.
+Per-request DB/Redis counts are collected in a RequestStats object held in
+a context variable, so concurrent requests on one event loop never mix.
+"""
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+FAST_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Label for requests that matched no route: raw paths would explode cardinality
+UNMATCHED_ROUTE = "unmatched"
+# Cap on the statements kept for one profiled request (app/core/query_profiler.py)
+MAX_RECORDED_STATEMENTS = 500
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+db_queries_per_request = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed while handling one request",
+    ["route"],
+    buckets=COUNT_BUCKETS,
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency",
+    buckets=FAST_BUCKETS,
+)
+redis_calls_per_request = Histogram(
+    "redis_calls_per_request",
+    "Redis round-trips made while handling one request",
+    ["route"],
+    buckets=COUNT_BUCKETS,
+)
+redis_command_duration = Histogram(
+    "redis_command_duration_seconds",
+    "Redis round-trip latency by command (PIPELINE for batched calls)",
+    ["command"],
+    buckets=FAST_BUCKETS,
+)
+
+# Gauges take the worst live worker: one worker with an open circuit or an
+# unready filter is what needs attention
+BREAKER_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+circuit_breaker_state = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state: 0 closed, 1 half-open, 2 open",
+    ["name"],
+    multiprocess_mode="livemax",
+)
+circuit_breaker_opened = Counter(
+    "circuit_breaker_opened",
+    "Times the circuit opened",
+    ["name"],
+)
+circuit_breaker_short_circuited = Counter(
+    "circuit_breaker_short_circuited_calls",
+    "Calls failed fast while the circuit was open or probing",
+    ["name"],
+)
+revocation_filter_ready = Gauge(
+    "revocation_filter_ready",
+    "1 once the revocation Bloom filter has been rebuilt from Redis",
+    multiprocess_mode="livemin",
+)
+revocation_filter_round_trips_saved = Counter(
+    "revocation_filter_round_trips_saved",
+    "Revocation checks answered by the Bloom filter without Redis",
+)
+revocation_filter_false_positives = Counter(
+    "revocation_filter_false_positives",
+    "Bloom filter hits that Redis showed were not revoked",
+)
+revocation_filter_false_positive_rate = Gauge(
+    "revocation_filter_false_positive_rate",
+    "False positives as a share of checks for non-revoked tokens",
+    multiprocess_mode="livemax",
+)
+
+
+# -------------------------
+# Per-request stats
+# -------------------------
+@dataclass(slots=True)
+class RequestStats:
+    started_ns: int
+    db_queries: int = 0
+    db_time_ns: int = 0
+    redis_calls: int = 0
+    redis_time_ns: int = 0
+    auth_time_ns: int = 0
+    # SQL text of each query; None unless the query profiler sampled the request
+    statements: list[str] | None = None
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def start_request() -> RequestStats:
+    stats = RequestStats(started_ns=time.perf_counter_ns())
+    _request_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+def route_template(scope: dict) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+def observe_request(scope: dict, method: str, status_code: int, stats: RequestStats) -> float:
+    """Records a finished request; returns its duration in seconds."""
+    duration = (time.perf_counter_ns() - stats.started_ns) / 1e9
+    route = route_template(scope)
+    http_request_duration.labels(method, route, str(status_code)).observe(duration)
+    db_queries_per_request.labels(route).observe(stats.db_queries)
+    redis_calls_per_request.labels(route).observe(stats.redis_calls)
+    return duration
+
+
+# -------------------------
+# SQLAlchemy
+# -------------------------
+def instrument_engine(engine):
+    """Times every statement run through `engine` (a sync Engine)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_ns", []).append(time.perf_counter_ns())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter_ns() - conn.info["query_started_ns"].pop()
+        db_query_duration.observe(elapsed / 1e9)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_time_ns += elapsed
+            if stats.statements is not None and len(stats.statements) < MAX_RECORDED_STATEMENTS:
+                stats.statements.append(statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # The statement failed, after_cursor_execute will not run
+        if context.connection is not None:
+            started = context.connection.info.get("query_started_ns")
+            if started:
+                started.pop()
+
+
+# -------------------------
+# Redis
+# -------------------------
+def observe_redis(command: str, elapsed_ns: int):
+    redis_command_duration.labels(command).observe(elapsed_ns / 1e9)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.redis_calls += 1
+        stats.redis_time_ns += elapsed_ns
+
+
+# -------------------------
+# Exposition
+# -------------------------
+def render_metrics() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,275 @@
+"""
+Pure ASGI middlewares.
+
+Unlike @app.middleware("http") (Starlette's BaseHTTPMiddleware) these run
+in the request's own task, add no memory streams between the app and the
+server, and pass streaming responses through chunk by chunk.
+"""
+import time
+import uuid
+import zlib
+
+from app.core.logger import logger, request_id_var, should_log_request
+from app.core.metrics import start_request, observe_request, route_template
+from app.core.query_profiler import query_profiler
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+
+def _header(scope, name: bytes) -> str:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+# -------------------------
+# Request id
+# -------------------------
+class RequestIdMiddleware:
+    """
+    Takes X-Request-ID from the caller (e.g. the load balancer) or makes one,
+    exposes it to logging through request_id_var and echoes it back.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_id = _header(scope, b"x-request-id")[:128] or uuid.uuid4().hex
+        request_id_var.set(request_id)
+        header = (b"x-request-id", request_id.encode("latin-1"))
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        await self.app(scope, receive, send_with_id)
+
+
+# -------------------------
+# Timing, metrics, access log
+# -------------------------
+class TimingMiddleware:
+    """
+    Times the request with perf_counter_ns, records the Prometheus metrics,
+    writes the access log and adds:
+
+    - the RateLimit-* headers a RateLimiter dependency left in
+      request.state.rate_limit_headers
+    - X-DB-Queries, the number of SQL statements run before the response
+    - a Server-Timing header splitting the time into db, redis and auth
+      (those can overlap: auth includes its own user lookup) and total app
+      time up to the response start
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = start_request()
+        query_profiler.begin(stats)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", ()))
+
+                rate_limit_headers = scope.get("state", {}).get("rate_limit_headers")
+                if rate_limit_headers:
+                    # A 429 already carries them on the HTTPException
+                    present = {key for key, _ in headers}
+                    for name, value in rate_limit_headers.items():
+                        key = name.lower().encode("latin-1")
+                        if key not in present:
+                            headers.append((key, str(value).encode("latin-1")))
+
+                headers.append((b"x-db-queries", str(stats.db_queries).encode()))
+
+                if self.server_timing:
+                    total_ms = (time.perf_counter_ns() - stats.started_ns) / 1e6
+                    headers.append((b"server-timing", (
+                        f"db;dur={stats.db_time_ns / 1e6:.2f};desc=\"{stats.db_queries} queries\", "
+                        f"redis;dur={stats.redis_time_ns / 1e6:.2f};desc=\"{stats.redis_calls} calls\", "
+                        f"auth;dur={stats.auth_time_ns / 1e6:.2f}, "
+                        f"app;dur={total_ms:.2f}"
+                    ).encode("latin-1")))
+
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration = observe_request(scope, scope["method"], status_code, stats)
+            query_profiler.finish(scope, status_code, stats)
+            if should_log_request(status_code):
+                path = scope["path"]
+                logger.info(
+                    f"{scope['method']} {path} {status_code}",
+                    extra={"fields": {
+                        "method": scope["method"],
+                        "path": path,
+                        "route": route_template(scope),
+                        "status": status_code,
+                        "duration_ms": round(duration * 1000, 2),
+                        "db_queries": stats.db_queries,
+                        "redis_calls": stats.redis_calls,
+                    }}
+                )
+
+
+# -------------------------
+# Compression
+# -------------------------
+COMPRESSIBLE_TYPES = (
+    "application/json", "text/", "application/javascript", "application/xml",
+    "image/svg+xml",
+)
+
+
+class _Compressor:
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=min(level, 11))
+        else:
+            # wbits 16+ writes a gzip header and trailer
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data)
+        return self._compressor.compress(data)
+
+    def sync_flush(self) -> bytes:
+        # Emits everything compressed so far without ending the stream
+        if self.encoding == "br":
+            return self._compressor.flush()
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    Brotli (when the brotli package is installed) or gzip, chosen from
+    Accept-Encoding. Single-body responses below `minimum_size` bytes and
+    non-text content types are passed through untouched; streaming
+    responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, app, minimum_size: int = 1000, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _encoding(self, scope) -> str | None:
+        accepted = {
+            part.split(";")[0].strip()
+            for part in _header(scope, b"accept-encoding").lower().split(",")
+        }
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = self._encoding(scope)
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", ()))
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                passthrough = (
+                    b"content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    # Held until the first body chunk shows the size
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = [
+                    (key, value) for key, value in start_message.get("headers", ())
+                    if key != b"content-length"
+                ]
+
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+
+                compressor = _Compressor(
+                    encoding,
+                    self.brotli_quality if encoding == "br" else self.gzip_level,
+                )
+                headers.append((b"content-encoding", encoding.encode()))
+                vary = [value for key, value in headers if key == b"vary"]
+                if not vary:
+                    headers.append((b"vary", b"Accept-Encoding"))
+                elif not any(b"accept-encoding" in value.lower() or value.strip() == b"*" for value in vary):
+                    headers = [
+                        (key, value + b", Accept-Encoding" if key == b"vary" else value)
+                        for key, value in headers
+                    ]
+
+                if not more_body:
+                    body = compressor.compress(body) + compressor.flush()
+                    headers.append((b"content-length", str(len(body)).encode()))
+                    await send({**start_message, "headers": headers})
+                    start_message = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                await send({**start_message, "headers": headers})
+                start_message = None
+
+            # Flush every chunk: a streamed event must reach the client now,
+            # not when the compressor's buffer happens to fill
+            chunk = compressor.compress(body)
+            chunk += compressor.sync_flush() if more_body else compressor.flush()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
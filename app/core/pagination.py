@@ -0,0 +1,42 @@
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+
+# -------------------------
+# Keyset cursors
+# -------------------------
+def encode_cursor(sort: str, sort_value, last_id: int) -> str:
+    raw = json.dumps([sort, sort_value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+# JSON type of the sort value each cursor kind carries (bool is excluded
+# below even though it subclasses int)
+CURSOR_VALUE_TYPES = {
+    "id": int,
+    "title": str,
+    "rank": (int, float),
+}
+
+
+def decode_cursor(cursor: str, sort: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, sort_value, last_id = json.loads(
+            base64.urlsafe_b64decode(padded)
+        )
+        if cursor_sort != sort:
+            raise ValueError("cursor is for another sort")
+        if isinstance(sort_value, bool) or not isinstance(sort_value, CURSOR_VALUE_TYPES[sort]):
+            raise ValueError("sort value does not match the sort column")
+        if isinstance(last_id, bool) or not isinstance(last_id, int):
+            raise ValueError("last id is not an integer")
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    return sort_value, last_id
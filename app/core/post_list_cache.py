@@ -0,0 +1,162 @@
+import hashlib
+import json
+import math
+import time
+from dataclasses import dataclass
+
+from app.core.config import get_settings
+from app.core.circuit_breaker import fail_open
+from app.core.redis import async_redis_client, pipeline_execute, redis_breaker
+
+settings = get_settings()
+
+VERSION_PREFIX = "posts:version:"
+ENTRY_PREFIX = "posts:list:"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPostList:
+    key: str
+    version: str
+    etag: str
+    # None on a miss: the caller builds the page and passes it to store()
+    data: dict | None
+
+
+class PostListCache:
+    """
+    Redis cache of /posts/me pages, invalidated by a per-user version.
+
+    Every post write for a user replaces their version, which invalidates
+    all of their cached pages in O(1): entries remember the version they
+    were built under and are ignored once it changes, then age out after
+    `ttl_seconds`. The ETag is derived from (version, query), so a client
+    revalidating an unchanged listing gets a 304 without the page being
+    read from anywhere.
+
+    A bump that fails (Redis down) leaves the old version in place, so
+    this worker bypasses the cache for that user until a bump goes
+    through. Other workers cannot know, which is why `ttl_seconds` is
+    kept within the read-your-writes window.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.bypassed = 0
+        # Users whose last bump failed: their cached pages may be stale
+        self._dirty: set[int] = set()
+
+    @staticmethod
+    def _version_key(user_id: int) -> str:
+        return f"{VERSION_PREFIX}{user_id}"
+
+    async def _seed_version(self, user_id: int) -> str | None:
+        # First lookup for this user, or the key was evicted: store a fresh
+        # version (SET NX, so concurrent lookups agree on one) rather than
+        # a constant that entries from before the eviction could match
+        key = self._version_key(user_id)
+        version = str(time.time_ns())
+        created = await redis_breaker.call(
+            async_redis_client.set, key, version, nx=True,
+            fallback=fail_open(None, "Post list cache version seed"),
+        )
+        if created:
+            return version
+        return await redis_breaker.call(
+            async_redis_client.get, key,
+            fallback=fail_open(None, "Post list cache version seed"),
+        )
+
+    async def lookup(self, user_id: int, params: dict) -> CachedPostList | None:
+        """Returns None when Redis is unavailable: serve uncached."""
+        if user_id in self._dirty:
+            await self.bump(user_id)
+            if user_id in self._dirty:
+                self.bypassed += 1
+                return None
+
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        key = f"{ENTRY_PREFIX}{user_id}:{digest}"
+
+        values = await redis_breaker.call(
+            pipeline_execute,
+            ("get", self._version_key(user_id)),
+            ("get", key),
+            fallback=fail_open(None, "Post list cache lookup"),
+        )
+        if values is None:
+            return None
+
+        version, raw = values
+        if version is None:
+            version = await self._seed_version(user_id)
+            if version is None:
+                return None
+        data = None
+        if raw is not None:
+            entry = json.loads(raw)
+            if entry["version"] == version:
+                data = entry["data"]
+
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return CachedPostList(
+            key=key,
+            version=version,
+            etag=f'"{version}-{digest}"',
+            data=data,
+        )
+
+    def not_modified_for(self, cached: CachedPostList | None, if_none_match: str | None) -> bool:
+        if cached is None or not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if cached.etag in tags or "*" in tags:
+            self.not_modified += 1
+            return True
+        return False
+
+    async def store(self, cached: CachedPostList, data: dict):
+        entry = json.dumps({"version": cached.version, "data": data}, separators=(",", ":"))
+        await redis_breaker.call(
+            async_redis_client.set, cached.key, entry, ex=self.ttl_seconds,
+            fallback=fail_open(None, "Post list cache store"),
+        )
+
+    async def bump(self, user_id: int):
+        # A fresh value rather than INCR: a version key lost to eviction can
+        # never come back with a value that old entries were built under
+        bumped = await redis_breaker.call(
+            async_redis_client.set, self._version_key(user_id), time.time_ns(),
+            fallback=fail_open(None, "Post list cache invalidation"),
+        )
+        if bumped is None:
+            self._dirty.add(user_id)
+        else:
+            self._dirty.discard(user_id)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "bypassed": self.bypassed,
+            "dirty_users": len(self._dirty),
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Capped so a page left stale by a failed bump on another worker is never
+# served for longer than the read-your-writes window
+post_list_cache = PostListCache(ttl_seconds=min(
+    settings.POSTS_CACHE_TTL_SECONDS, math.ceil(settings.READ_YOUR_WRITES_SECONDS),
+))
@@ -0,0 +1,70 @@
+import threading
+
+from app.core.logger import logger
+from app.core.redis import redis_client
+
+# Reconnect backoff: doubles from the first delay up to the cap
+RETRY_FIRST_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+
+
+class ChannelListener:
+    """
+    Background thread dispatching the messages of one Redis pub/sub
+    channel to `handler`. Used by the in-process caches to hear about
+    writes made by other gunicorn workers.
+
+    start() never blocks and never fails: if Redis is down (at boot or
+    later) the thread keeps resubscribing with backoff. `on_subscribed`
+    runs after every successful (re)subscribe and may raise to retry;
+    `on_error` runs when the subscription is lost, i.e. when messages
+    may have been missed.
+    """
+
+    def __init__(self, name: str, channel: str, handler,
+                 on_subscribed=None, on_error=None):
+        self.name = name
+        self.channel = channel
+        self.handler = handler
+        self.on_subscribed = on_subscribed
+        self.on_error = on_error
+        self._thread = None
+        self._stopped = threading.Event()
+        self._delay = RETRY_FIRST_SECONDS
+
+    def _listen(self):
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(**{self.channel: self.handler})
+            if self.on_subscribed is not None:
+                self.on_subscribed()
+            self._delay = RETRY_FIRST_SECONDS
+            while not self._stopped.is_set():
+                # Calls self.handler for each message
+                pubsub.get_message(timeout=1.0)
+        finally:
+            pubsub.close()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception as exc:
+                if self.on_error is not None:
+                    self.on_error()
+                logger.warning(f"{self.name} listener error: {exc}; retrying in {self._delay:.0f}s")
+                self._stopped.wait(self._delay)
+                self._delay = min(self._delay * 2, RETRY_MAX_SECONDS)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name} listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join(timeout=2.0)
+            self._thread = None
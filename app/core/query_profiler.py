@@ -0,0 +1,133 @@
+"""
+Per-request SQL profile and N+1 detection.
+
+For a sampled share of requests (QUERY_PROFILER_SAMPLE_RATE, 0 disables
+it) the statement text of every query is kept in the request's
+RequestStats (see app/core/metrics.py). When the request finishes the
+statements are grouped by their normalized form; one that ran
+QUERY_N_PLUS_ONE_THRESHOLD times or more is an N+1 candidate (typically a
+lazy relationship loaded row by row) and is logged with its route.
+
+Only the SQL text is recorded, never the parameters, so profiling is safe
+to leave on at a low rate in production.
+"""
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from prometheus_client import Counter as PrometheusCounter
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.metrics import RequestStats, route_template
+
+settings = get_settings()
+
+n_plus_one_requests = PrometheusCounter(
+    "db_n_plus_one_requests_total",
+    "Profiled requests that repeated a statement QUERY_N_PLUS_ONE_THRESHOLD+ times",
+    ["route"],
+)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+# $1 (asyncpg), %(name)s / %s (psycopg), :name, ?
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+")
+# Expanding IN (?, ?, ?) lists vary in length with the input
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """SQL with literals and parameters replaced by ? and whitespace collapsed."""
+    statement = _STRING.sub("?", statement)
+    statement = _PARAMETER.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = _PARAMETER_LIST.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+@dataclass(slots=True)
+class QueryProfile:
+    method: str
+    route: str
+    status: int
+    query_count: int
+    # normalized statement -> executions; empty when the request was not sampled
+    statements: Counter
+    n_plus_one: list[tuple[str, int]]
+
+
+class QueryProfiler:
+    def __init__(self, sample_rate: float, n_plus_one_threshold: int):
+        self.sample_rate = sample_rate
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.profiled = 0
+        self.flagged = 0
+        self._observers = []
+
+    def begin(self, stats: RequestStats):
+        """Makes the engine hook record this request's statements if it is sampled."""
+        if self.sample_rate >= 1.0 or (self.sample_rate > 0 and random.random() < self.sample_rate):
+            stats.statements = []
+
+    def finish(self, scope: dict, status_code: int, stats: RequestStats):
+        if stats.statements is None and not self._observers:
+            return
+
+        statements = Counter(normalize_statement(s) for s in stats.statements or ())
+        n_plus_one = [
+            (statement, count) for statement, count in statements.most_common()
+            if count >= self.n_plus_one_threshold
+        ]
+        profile = QueryProfile(
+            method=scope["method"],
+            route=route_template(scope),
+            status=status_code,
+            query_count=stats.db_queries,
+            statements=statements,
+            n_plus_one=n_plus_one,
+        )
+
+        if stats.statements is not None:
+            self.profiled += 1
+            if n_plus_one:
+                self.flagged += 1
+                n_plus_one_requests.labels(profile.route).inc()
+                statement, count = n_plus_one[0]
+                logger.warning(
+                    f"Possible N+1 on {profile.method} {profile.route}: statement repeated {count} times",
+                    extra={"fields": {
+                        "route": profile.route,
+                        "db_queries": profile.query_count,
+                        "repeated": count,
+                        "statement": statement,
+                    }}
+                )
+
+        for observer in self._observers:
+            observer(profile)
+
+    # -------------------------
+    # Observers (used by the query budget pytest plugin)
+    # -------------------------
+    def subscribe(self, observer):
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer):
+        self._observers.remove(observer)
+
+    def stats(self) -> dict:
+        return {
+            "sample_rate": self.sample_rate,
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "profiled_requests": self.profiled,
+            "n_plus_one_requests": self.flagged,
+        }
+
+
+query_profiler = QueryProfiler(
+    sample_rate=settings.QUERY_PROFILER_SAMPLE_RATE,
+    n_plus_one_threshold=settings.QUERY_N_PLUS_ONE_THRESHOLD,
+)
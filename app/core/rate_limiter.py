@@ -1,24 +1,349 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
 from fastapi import HTTPException, status, Request
-from app.core.redis import redis_client
+from jose import JWTError
+
+from app.core.config import get_settings
+from app.core.circuit_breaker import fail_closed
+from app.core.redis import async_redis_client, redis_breaker
+from app.core.security import decode_access_token
+
+settings = get_settings()
+
+
+# -------------------------
+# Sliding window log (one round-trip per request)
+# -------------------------
+# KEYS[1] = limiter key
+# ARGV    = window_ms, limit, unique member id
+# Returns {allowed, remaining, reset_ms}. Uses the Redis clock so every
+# gunicorn worker agrees on the window.
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[3])
+    count = count + 1
+    allowed = 1
+end
+redis.call('PEXPIRE', key, window)
+
+local reset = window
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window - now
+end
+
+return {allowed, limit - count, reset}
+"""
+
+_sliding_window = async_redis_client.register_script(SLIDING_WINDOW_LUA)
+
+
+# -------------------------
+# Global token bucket for quota leases
+# -------------------------
+# KEYS[1] = bucket key
+# ARGV    = capacity, refill per ms, requested lease, max overshoot, ttl ms,
+#           unused tokens given back from an expired or evicted lease
+# Grants the full lease while the bucket stays above -max_overshoot,
+# otherwise whatever whole tokens are left. Returns
+# {granted, tokens_left, wait_ms_for_next_token}.
+TOKEN_BUCKET_LEASE_LUA = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local overshoot = tonumber(ARGV[4])
+local returned = tonumber(ARGV[6]) or 0
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate + returned)
+
+local granted = 0
+if tokens - requested >= -overshoot then
+    granted = requested
+elseif tokens >= 1 then
+    granted = math.floor(tokens)
+end
+tokens = tokens - granted
+
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', key, tonumber(ARGV[5]))
+
+local wait = 0
+if tokens < 1 then
+    wait = math.ceil((1 - tokens) / rate)
+end
+
+return {granted, math.floor(tokens), wait}
+"""
+
+_token_bucket_lease = async_redis_client.register_script(TOKEN_BUCKET_LEASE_LUA)
+
+# Fails closed: without Redis we cannot enforce limits, so reject with 503
+_limiter_unavailable = fail_closed("Rate limiting", redis_breaker)
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    name: str
+    limit: int
+    window_seconds: int
+    # "ip" limits per client address, "user" per authenticated user (falls
+    # back to the address for anonymous requests)
+    scope: str = "ip"
+    # lease_size > 0 enables the local token-bucket tier: each worker leases
+    # this many requests from Redis at a time and serves them in-process.
+    # The global bucket may go up to max_overshoot below zero to hand out a
+    # full lease; unused quota is dropped after lease_ttl_seconds.
+    lease_size: int = 0
+    max_overshoot: int = 0
+    lease_ttl_seconds: float = 1.0
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int
+
+    def headers(self) -> dict:
+        return {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(max(self.remaining, 0)),
+            "RateLimit-Reset": str(self.reset_seconds),
+        }
 
-RATE_LIMIT = 5
-WINDOW_SECONDS = 60
 
+async def hit(policy: RateLimitPolicy, identity: str) -> RateLimitResult:
+    allowed, remaining, reset_ms = await redis_breaker.call(
+        _sliding_window,
+        keys=[f"rate_limit:{policy.name}:{identity}"],
+        args=[policy.window_seconds * 1000, policy.limit, uuid.uuid4().hex],
+        fallback=_limiter_unavailable,
+    )
+    return RateLimitResult(
+        allowed=bool(allowed),
+        limit=policy.limit,
+        remaining=int(remaining),
+        reset_seconds=max(1, -(-int(reset_ms) // 1000)),
+    )
 
-async def rate_limiter(request: Request):
-    client_ip = request.client.host
-    key = f"rate_limit:{client_ip}"
 
-    current = redis_client.get(key)
+# -------------------------
+# Local token-bucket tier
+# -------------------------
+class _Lease:
+    __slots__ = ("policy", "tokens", "expires_at", "retry_at", "global_remaining", "lock")
 
-    if current is None:
-        redis_client.setex(key, WINDOW_SECONDS, 1)
-        return
+    def __init__(self, policy: RateLimitPolicy):
+        self.policy = policy
+        self.tokens = 0
+        self.expires_at = 0.0
+        # Set when Redis had nothing left: reject locally until then
+        self.retry_at = 0.0
+        self.global_remaining = 0
+        self.lock = asyncio.Lock()
 
-    if int(current) >= RATE_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many requests. Try again later."
+
+class LeasedLimiter:
+    """
+    Serves requests from quota leased out of a global Redis token bucket and
+    only goes back to Redis once the local lease is used up or expired. Cuts
+    Redis traffic by roughly a factor of lease_size; globally the limit is
+    exceeded by at most max_overshoot requests.
+
+    Tokens left in a lease when it expires or is evicted go back to the
+    global bucket, so a client spacing its requests further apart than
+    lease_ttl_seconds is charged one token per request, not one lease.
+    """
+
+    def __init__(self, max_keys: int = 10_000):
+        self.max_keys = max_keys
+        self.local_hits = 0
+        self.lease_requests = 0
+        self._leases: OrderedDict[str, _Lease] = OrderedDict()
+        # Background give-backs for evicted leases, referenced until done
+        self._returns: set[asyncio.Task] = set()
+
+    @staticmethod
+    async def _call_bucket(policy: RateLimitPolicy, key: str, requested: int, returned: int):
+        return await redis_breaker.call(
+            _token_bucket_lease,
+            fallback=_limiter_unavailable,
+            keys=[key],
+            args=[
+                policy.limit,
+                policy.limit / (policy.window_seconds * 1000),
+                requested,
+                policy.max_overshoot,
+                policy.window_seconds * 2000,
+                returned,
+            ],
         )
 
-    redis_client.incr(key)
\ No newline at end of file
+    async def _give_back(self, key: str, lease: _Lease):
+        try:
+            await self._call_bucket(lease.policy, key, 0, lease.tokens)
+        except HTTPException:
+            pass  # Redis down: the tokens refill with time anyway
+
+    def _lease_for(self, key: str, policy: RateLimitPolicy) -> _Lease:
+        lease = self._leases.get(key)
+        if lease is None:
+            lease = self._leases[key] = _Lease(policy)
+            while len(self._leases) > self.max_keys:
+                evicted_key, evicted = self._leases.popitem(last=False)
+                if evicted.tokens > 0:
+                    task = asyncio.create_task(self._give_back(evicted_key, evicted))
+                    self._returns.add(task)
+                    task.add_done_callback(self._returns.discard)
+        else:
+            self._leases.move_to_end(key)
+        return lease
+
+    async def hit(self, policy: RateLimitPolicy, identity: str) -> RateLimitResult:
+        key = f"rate_limit:bucket:{policy.name}:{identity}"
+        lease = self._lease_for(key, policy)
+
+        async with lease.lock:
+            now = time.monotonic()
+            if lease.tokens <= 0 and now < lease.retry_at:
+                self.local_hits += 1
+                return RateLimitResult(
+                    allowed=False,
+                    limit=policy.limit,
+                    remaining=0,
+                    reset_seconds=max(1, -(-int((lease.retry_at - now) * 1000) // 1000)),
+                )
+
+            if lease.tokens <= 0 or lease.expires_at <= now:
+                self.lease_requests += 1
+                granted, remaining, wait_ms = await self._call_bucket(
+                    policy, key, policy.lease_size, max(lease.tokens, 0)
+                )
+                lease.tokens = int(granted)
+                lease.global_remaining = max(int(remaining), 0)
+                lease.expires_at = now + policy.lease_ttl_seconds
+
+                if lease.tokens <= 0:
+                    lease.retry_at = now + int(wait_ms) / 1000
+                    return RateLimitResult(
+                        allowed=False,
+                        limit=policy.limit,
+                        remaining=0,
+                        reset_seconds=max(1, -(-int(wait_ms) // 1000)),
+                    )
+            else:
+                self.local_hits += 1
+
+            lease.tokens -= 1
+            return RateLimitResult(
+                allowed=True,
+                limit=policy.limit,
+                remaining=lease.global_remaining + lease.tokens,
+                reset_seconds=policy.window_seconds,
+            )
+
+    def stats(self) -> dict:
+        total = self.local_hits + self.lease_requests
+        return {
+            "keys": len(self._leases),
+            "local_hits": self.local_hits,
+            "lease_requests": self.lease_requests,
+            "redis_calls_per_request": round(self.lease_requests / total, 4) if total else 0.0,
+        }
+
+
+leased_limiter = LeasedLimiter()
+
+
+def _identity(request: Request, policy: RateLimitPolicy) -> str:
+    if policy.scope == "user":
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                return f"user:{decode_access_token(token)['sub']}"
+            except (JWTError, KeyError):
+                pass
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class RateLimiter:
+    """
+    Route dependency enforcing a RateLimitPolicy:
+
+        @router.post("/login", dependencies=[Depends(RateLimiter(LOGIN_POLICY))])
+
+    Rejected requests get a 429 with Retry-After; every response carries
+    the RateLimit-* headers (added by TimingMiddleware in app/core/middleware.py from
+    request.state.rate_limit_headers).
+    """
+
+    def __init__(self, policy: RateLimitPolicy):
+        self.policy = policy
+
+    async def __call__(self, request: Request):
+        identity = _identity(request, self.policy)
+        if self.policy.lease_size > 0:
+            result = await leased_limiter.hit(self.policy, identity)
+        else:
+            result = await hit(self.policy, identity)
+        headers = result.headers()
+        request.state.rate_limit_headers = headers
+
+        if not result.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Try again later.",
+                headers={**headers, "Retry-After": str(result.reset_seconds)}
+            )
+
+
+# -------------------------
+# Policies
+# -------------------------
+LOGIN_POLICY = RateLimitPolicy(name="login", limit=5, window_seconds=60, scope="ip")
+POST_WRITE_POLICY = RateLimitPolicy(
+    name="post_write",
+    limit=60,
+    window_seconds=60,
+    scope="user",
+    lease_size=settings.RATE_LIMIT_LEASE_SIZE,
+    max_overshoot=settings.RATE_LIMIT_MAX_OVERSHOOT,
+    lease_ttl_seconds=settings.RATE_LIMIT_LEASE_TTL_SECONDS,
+)
+# One bulk request writes up to POST_BULK_MAX_ITEMS posts
+POST_BULK_POLICY = RateLimitPolicy(name="post_bulk", limit=10, window_seconds=60, scope="user")
+# Each search is a ranked full-text query over all of the user's posts
+POST_SEARCH_POLICY = RateLimitPolicy(
+    name="post_search",
+    limit=30,
+    window_seconds=60,
+    scope="user",
+    lease_size=settings.RATE_LIMIT_LEASE_SIZE,
+    max_overshoot=settings.RATE_LIMIT_MAX_OVERSHOOT,
+    lease_ttl_seconds=settings.RATE_LIMIT_LEASE_TTL_SECONDS,
+)
+
+rate_limiter = RateLimiter(LOGIN_POLICY)
\ No newline at end of file
@@ -0,0 +1,97 @@
+import threading
+import time
+
+from app.core.config import get_settings
+from app.core.circuit_breaker import fail_open
+from app.core.redis import async_redis_client, redis_breaker
+from app.core.pubsub import ChannelListener
+
+settings = get_settings()
+
+WRITES_CHANNEL = "db:writes"
+
+# Expired entries are only swept once the table grows past this size
+SWEEP_THRESHOLD = 10_000
+
+
+class RecentWrites:
+    """
+    Tracks which users wrote to the primary in the last `window_seconds`.
+
+    get_read_db sends those users' reads to the primary so they see their
+    own writes while the replica catches up; everyone else reads from the
+    replica. Writes are broadcast over Redis pub/sub so the request can
+    land on any gunicorn worker.
+    """
+
+    def __init__(self, window_seconds: float, enabled: bool = True):
+        self.window_seconds = window_seconds
+        # Without a replica every read already goes to the primary
+        self.enabled = enabled
+        self.primary_reads = 0
+        self.replica_reads = 0
+        self._until: dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._listener = ChannelListener("Recent writes", WRITES_CHANNEL, self._on_write)
+
+    def _mark_local(self, user_id: int):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._until) > SWEEP_THRESHOLD:
+                self._until = {u: t for u, t in self._until.items() if t > now}
+            self._until[user_id] = now + self.window_seconds
+
+    async def mark(self, user_id: int):
+        if not self.enabled:
+            return
+        self._mark_local(user_id)
+        # Other workers may serve a stale read if this is not broadcast
+        await redis_breaker.call(
+            async_redis_client.publish, WRITES_CHANNEL, user_id,
+            fallback=fail_open(None, "Recent write broadcast"),
+        )
+
+    def reads_from_primary(self, user_id: int | None) -> bool:
+        if not self.enabled:
+            return True
+        if user_id is not None:
+            until = self._until.get(user_id)
+            if until is not None and until > time.monotonic():
+                self.primary_reads += 1
+                return True
+        self.replica_reads += 1
+        return False
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            sticky = sum(1 for t in self._until.values() if t > now)
+        return {
+            "enabled": self.enabled,
+            "window_seconds": self.window_seconds,
+            "sticky_users": sticky,
+            "primary_reads": self.primary_reads,
+            "replica_reads": self.replica_reads,
+        }
+
+    # -------------------------
+    # Cross-worker sync
+    # -------------------------
+    def _on_write(self, message):
+        try:
+            self._mark_local(int(message["data"]))
+        except (TypeError, ValueError):
+            pass
+
+    def start_listener(self):
+        if self.enabled:
+            self._listener.start()
+
+    def stop_listener(self):
+        self._listener.stop()
+
+
+recent_writes = RecentWrites(
+    window_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    enabled=bool(settings.DATABASE_REPLICA_URL),
+)
@@ -1,8 +1,75 @@
+import asyncio
+import time
+
 import redis
-import os
+import redis.asyncio as aioredis
+
+from app.core.config import get_settings
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.metrics import observe_redis
+
+settings = get_settings()
+
+_pool_options = dict(
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    decode_responses=True,
+)
 
+# Sync client: only for background threads (pub/sub listeners) and scripts
+# such as Alembic migrations, never from inside a request
 redis_client = redis.Redis(
-    host=os.getenv("REDIS_HOST", "localhost"),
-    port=int(os.getenv("REDIS_PORT", 6379)),
-    decode_responses=True
-)
\ No newline at end of file
+    connection_pool=redis.ConnectionPool.from_url(settings.REDIS_URL, **_pool_options)
+)
+
+class InstrumentedRedis(aioredis.Redis):
+    # Every single-command round-trip (scripts included) passes through here
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter_ns()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            observe_redis(str(args[0]).upper(), time.perf_counter_ns() - started)
+
+
+# Async client shared by every request in this worker
+async_pool = aioredis.ConnectionPool.from_url(settings.REDIS_URL, **_pool_options)
+async_redis_client = InstrumentedRedis(connection_pool=async_pool)
+
+# Wrap request-path calls in redis_breaker.call(...) so an outage costs
+# microseconds instead of a socket timeout per request
+redis_breaker = CircuitBreaker(
+    name="redis",
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    cooldown_seconds=settings.REDIS_BREAKER_COOLDOWN_SECONDS,
+)
+
+
+async def init_redis(connections: int = 1):
+    # Opens pooled connections so the first requests don't pay for them:
+    # concurrent PINGs each check out a connection of their own
+    await asyncio.gather(*(async_redis_client.ping() for _ in range(connections)))
+
+
+async def close_redis():
+    await async_redis_client.aclose()
+    await async_pool.disconnect()
+
+
+async def pipeline_execute(*commands):
+    """
+    Runs several commands in one round-trip and returns their results in
+    order:
+
+        exists, ttl = await pipeline_execute(("exists", key), ("ttl", key))
+    """
+    started = time.perf_counter_ns()
+    try:
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            for name, *args in commands:
+                getattr(pipe, name)(*args)
+            return await pipe.execute()
+    finally:
+        observe_redis("PIPELINE", time.perf_counter_ns() - started)
\ No newline at end of file
@@ -1,26 +1,48 @@
-from datetime import datetime
-from fastapi.responses import JSONResponse
+import time
+from datetime import datetime, timezone
 
+from fastapi.responses import ORJSONResponse
 
-def success_response(data=None, message="Success", status_code=200):
-    return JSONResponse(
+
+# -------------------------
+# Timestamp
+# -------------------------
+# Responses carry second-resolution timestamps; formatting one per second
+# instead of one per response keeps datetime off the hot path
+_timestamp_second = -1
+_timestamp_value = ""
+
+
+def response_timestamp() -> str:
+    global _timestamp_second, _timestamp_value
+    now = int(time.time())
+    if now != _timestamp_second:
+        _timestamp_value = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat()
+        _timestamp_second = now
+    return _timestamp_value
+
+
+def success_response(data=None, message="Success", status_code=200, headers=None):
+    return ORJSONResponse(
         status_code=status_code,
+        headers=headers,
         content={
             "success": True,
             "message": message,
             "data": data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": response_timestamp()
         }
     )
 
 
-def error_response(message="Something went wrong", status_code=400):
-    return JSONResponse(
+def error_response(message="Something went wrong", status_code=400, headers=None):
+    return ORJSONResponse(
         status_code=status_code,
+        headers=headers,
         content={
             "success": False,
             "error": message,
             "status_code": status_code,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": response_timestamp()
         }
-    )
\ No newline at end of file
+    )
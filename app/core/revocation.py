@@ -0,0 +1,146 @@
+import hashlib
+import time
+
+from jose import JWTError, jwt
+
+from app.core.bloom import RevokedTokenFilter
+from app.core.config import get_settings
+from app.core.circuit_breaker import fail_open, fail_closed
+from app.core.redis import redis_client, async_redis_client, pipeline_execute, redis_breaker
+from app.core.security import decode_token
+
+settings = get_settings()
+
+REVOKED_PREFIX = "revoked:"
+REVOKED_CHANNEL = "revocation:revoked"
+
+# Definite negatives from this filter skip the Redis lookup entirely
+revoked_filter = RevokedTokenFilter(
+    key_prefix=REVOKED_PREFIX,
+    channel=REVOKED_CHANNEL,
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    bucket_seconds=settings.REVOCATION_BLOOM_BUCKET_SECONDS,
+)
+
+
+# -------------------------
+# Token revocation store
+# -------------------------
+# One Redis key per revoked token id (`jti`), expiring when the token itself
+# would have expired: checks are a single O(1) EXISTS/MGET and the keyspace
+# never holds more than the currently-live revoked tokens.
+def token_id(token: str, claims: dict) -> str:
+    # Tokens issued before jti existed fall back to a digest of the token
+    return claims.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+
+
+def _key(jti: str) -> str:
+    return f"{REVOKED_PREFIX}{jti}"
+
+
+async def revoke(jti: str, exp: float) -> bool:
+    ttl = int(exp - time.time())
+    if ttl <= 0:
+        return False
+    # Store + notify the other workers' filters in one round-trip. A
+    # revocation that cannot be stored must not look like it succeeded.
+    await redis_breaker.call(
+        pipeline_execute,
+        ("set", _key(jti), 1, ttl),
+        ("publish", REVOKED_CHANNEL, revoked_filter.message(jti, exp)),
+        fallback=fail_closed("Token revocation", redis_breaker),
+    )
+    revoked_filter.add(jti, exp)
+    return True
+
+
+async def claim(jti: str, exp: float) -> bool:
+    """
+    Revokes `jti` unless it already is, in one atomic SET NX: of several
+    concurrent refreshes with the same token exactly one gets True.
+    """
+    ttl = int(exp - time.time())
+    if ttl <= 0:
+        return False
+    claimed, _ = await redis_breaker.call(
+        pipeline_execute,
+        ("set", _key(jti), 1, ttl, None, True),  # SET key 1 EX ttl NX
+        ("publish", REVOKED_CHANNEL, revoked_filter.message(jti, exp)),
+        fallback=fail_closed("Token revocation", redis_breaker),
+    )
+    revoked_filter.add(jti, exp)
+    return bool(claimed)
+
+
+async def revoke_token(token: str) -> bool:
+    """
+    Revokes a token we issued. Invalid or already expired tokens are
+    ignored: they are rejected anyway and must not be able to create keys.
+    """
+    try:
+        claims = decode_token(token)
+    except JWTError:
+        return False
+    return await revoke(token_id(token, claims), claims["exp"])
+
+
+async def is_revoked(jti: str) -> bool:
+    if not revoked_filter.might_be_revoked(jti):
+        return False
+
+    # Fails open: while Redis is down, tokens are only checked for
+    # signature and expiry
+    exists = await redis_breaker.call(
+        async_redis_client.exists, _key(jti),
+        fallback=fail_open(None, "Revocation check"),
+    )
+    if exists is None:
+        return False
+
+    revoked = exists == 1
+    revoked_filter.record_result(revoked)
+    return revoked
+
+
+async def is_revoked_many(jtis: list[str]) -> list[bool]:
+    results = [False] * len(jtis)
+    candidates = [i for i, jti in enumerate(jtis) if revoked_filter.might_be_revoked(jti)]
+    if not candidates:
+        return results
+
+    values = await redis_breaker.call(
+        async_redis_client.mget, [_key(jtis[i]) for i in candidates],
+        fallback=fail_open(None, "Revocation check"),
+    )
+    if values is None:
+        return results
+
+    for i, value in zip(candidates, values):
+        results[i] = value is not None
+        revoked_filter.record_result(results[i])
+    return results
+
+
+def drain_blacklisted_tokens(tokens) -> int:
+    """
+    Moves rows of the legacy SQL blacklisted_tokens table into the store.
+    The rows came from our own database, so claims are read unverified
+    (the signing key may have rotated since). Returns the number moved.
+    """
+    moved = 0
+    pipe = redis_client.pipeline(transaction=False)
+    now = time.time()
+
+    for token in tokens:
+        try:
+            claims = jwt.get_unverified_claims(token)
+        except JWTError:
+            continue
+        ttl = int(claims.get("exp", 0) - now)
+        if ttl > 0:
+            pipe.set(_key(token_id(token, claims)), 1, ex=ttl)
+            moved += 1
+
+    pipe.execute()
+    return moved
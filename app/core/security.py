@@ -1,16 +1,55 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 from typing import Optional
-import time
+import asyncio
+import calendar
+import multiprocessing
+import uuid
 
-from jose import JWTError, jwt
+from jose import JWTError
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
-from app.core.redis import redis_client
+from app.core.token_cache import TokenClaimsCache
+from app.core.jwt_backends import get_token_backend
+from app.core.exceptions import ServiceUnavailableException
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+token_cache = TokenClaimsCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
+
+PASSWORD_SCHEMES = ("bcrypt", "argon2")
+
+
+def build_pwd_context(
+    scheme: str = "bcrypt",
+    bcrypt_rounds: int = 12,
+    argon2_memory_cost: int = 65536,
+    argon2_time_cost: int = 3,
+    argon2_parallelism: int = 4,
+) -> CryptContext:
+    # The configured scheme comes first; the others stay verifiable but are
+    # deprecated, so needs_update() flags them for a rehash.
+    schemes = [scheme] + [s for s in PASSWORD_SCHEMES if s != scheme]
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__time_cost=argon2_time_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_pwd_context(
+    scheme=settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds=settings.BCRYPT_ROUNDS,
+    argon2_memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2_time_cost=settings.ARGON2_TIME_COST,
+    argon2_parallelism=settings.ARGON2_PARALLELISM,
+)
 
 
 # -------------------------
@@ -24,9 +63,106 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """
+    Returns (valid, new_hash). new_hash is only set when the password is
+    valid and the stored hash is outdated (old scheme or cost parameters).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+# -------------------------
+# Password hashing pool
+# -------------------------
+# Password hashing is ~250ms of CPU per call; running it in a separate process keeps
+# the worker's event loop (and every other request on it) responsive.
+_password_pool: ProcessPoolExecutor | None = None
+_password_jobs_in_flight = 0
+
+
+def _get_password_pool() -> ProcessPoolExecutor:
+    global _password_pool
+    if _password_pool is None:
+        # The pool starts on the first login, when the Redis listeners and
+        # the log thread are already running: forking then can leave a child
+        # stuck on a lock some thread held. Start children from a clean
+        # forkserver (spawn where that is unavailable) instead.
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _password_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _password_pool
+
+
+def _discard_password_pool(pool: ProcessPoolExecutor):
+    global _password_pool
+    # Concurrent failures of the same pool must not drop its replacement
+    if _password_pool is pool:
+        _password_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_password_pool():
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(wait=False, cancel_futures=True)
+        _password_pool = None
+
+
+async def _run_in_password_pool(fn, *args):
+    global _password_jobs_in_flight
+
+    # Shed load instead of letting a login burst queue up behind bcrypt
+    if _password_jobs_in_flight >= settings.PASSWORD_HASH_MAX_QUEUE:
+        raise ServiceUnavailableException(
+            detail="Too many concurrent password operations. Try again later.",
+            retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS
+        )
+
+    _password_jobs_in_flight += 1
+    pool = _get_password_pool()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # A child died (e.g. OOM-killed): drop the pool so the next call
+        # builds a fresh one, and fail this request with a retryable 503
+        _discard_password_pool(pool)
+        raise ServiceUnavailableException(
+            detail="Password service restarting. Try again later.",
+            retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS
+        )
+    finally:
+        _password_jobs_in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_password_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_password_pool(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str):
+    return await _run_in_password_pool(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
 # -------------------------
 # JWT utils
 # -------------------------
+def _encode_token(claims: dict) -> str:
+    # jti identifies the token in the revocation store
+    claims.setdefault("jti", uuid.uuid4().hex)
+    exp = claims.get("exp")
+    if isinstance(exp, datetime):
+        claims["exp"] = calendar.timegm(exp.utctimetuple())
+    return get_token_backend().encode(claims)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
 
@@ -36,26 +172,39 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         else timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "type": "access"})
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
-    )
+    return _encode_token(to_encode)
 
-    return encoded_jwt
 
+def _decode_token(token: str):
+    # Fast path: this exact token was already verified and has not expired
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
 
-def decode_access_token(token: str):
-    payload = jwt.decode(
-        token,
-        settings.SECRET_KEY,
-        algorithms=[settings.ALGORITHM],
-    )
+    payload = get_token_backend().decode(token)
+    token_cache.set(token, payload)
     return payload
 
 
+def decode_token(token: str):
+    """Signature and expiry only, whatever the token type (e.g. logout)."""
+    return _decode_token(token)
+
+
+def _decode_typed(token: str, token_type: str):
+    payload = _decode_token(token)
+    # A refresh token must not work as a bearer token, nor the reverse
+    if payload.get("type") != token_type:
+        raise JWTError(f"Expected a {token_type} token")
+    return payload
+
+
+def decode_access_token(token: str):
+    return _decode_typed(token, "access")
+
+
 def create_refresh_token(data: dict, expires_delta: timedelta):
     to_encode = data.copy()
 
@@ -65,25 +214,8 @@ def create_refresh_token(data: dict, expires_delta: timedelta):
         "type": "refresh"
     })
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
-    )
-
-    return encoded_jwt
+    return _encode_token(to_encode)
 
 
 def decode_refresh_token(token: str):
-    payload = jwt.decode(
-        token,
-        settings.SECRET_KEY,
-        algorithms=[settings.ALGORITHM],
-    )
-    return payload
-
-
-def blacklist_token(token: str, exp: int):
-    ttl = exp - int(time.time())
-    if ttl > 0:
-        redis_client.setex(token, ttl, "blacklisted")
\ No newline at end of file
+    return _decode_typed(token, "refresh")
\ No newline at end of file
@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.core.config import get_settings
+from app.core.circuit_breaker import fail_open
+from app.core.redis import async_redis_client, redis_breaker
+from app.core.pubsub import ChannelListener
+
+settings = get_settings()
+
+INVALIDATION_CHANNEL = "user_cache:invalidate"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedUser:
+    id: int
+    email: str
+    role: str
+    is_active: bool
+
+
+class UserCache:
+    """
+    Bounded LRU cache of user rows with a per-entry TTL.
+
+    Lets get_current_user skip the users SELECT on every request. Writes to
+    a user call invalidate(), which also broadcasts the id over Redis pub/sub
+    so every gunicorn worker drops its copy.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[float, CachedUser]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener = ChannelListener("User cache", INVALIDATION_CHANNEL, self._on_invalidate)
+
+    def get(self, user_id: int) -> CachedUser | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, user) -> CachedUser:
+        cached = CachedUser(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+        )
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[cached.id] = (expires_at, cached)
+            self._entries.move_to_end(cached.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return cached
+
+    def discard(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    async def invalidate(self, user_id: int):
+        self.discard(user_id)
+        # Other workers fall back to the TTL if this is not broadcast
+        await redis_breaker.call(
+            async_redis_client.publish, INVALIDATION_CHANNEL, user_id,
+            fallback=fail_open(None, "User cache invalidation broadcast"),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        total = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    # -------------------------
+    # Cross-worker invalidation
+    # -------------------------
+    def _on_invalidate(self, message):
+        try:
+            self.discard(int(message["data"]))
+        except (TypeError, ValueError):
+            pass
+
+    def start_listener(self):
+        self._listener.start()
+
+    def stop_listener(self):
+        self._listener.stop()
+
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
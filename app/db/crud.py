@@ -1,62 +1,101 @@
-from sqlalchemy.orm import Session
-from app.db import models
-from app.db.schemas import UserCreate 
-from sqlalchemy import Column,Integer,String
-from app.db.database import Base
-from app.core.security import hash_password,verify_password
-from app.db.models import BlacklistedToken
+from sqlalchemy import select, insert, delete, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.db import models, search
+from app.db.schemas import UserCreate
+from app.core.security import verify_password_async
+from app.core.user_cache import user_cache
+from app.core.recent_writes import recent_writes
+from app.core.post_list_cache import post_list_cache
 
 
-def create_user(db: Session, user: UserCreate):
+# -------------------------------
+# Relationship loader options
+# -------------------------------
+# User.posts, User.refresh_tokens and Post.owner are lazy: reading them on
+# each row of a result is one query per row (and fails on an AsyncSession).
+# Paths that serialize them pass one of these, so each relationship costs a
+# single SELECT ... WHERE <fk> IN (...) for the whole result.
+USER_WITH_POSTS = (selectinload(models.User.posts),)
+USER_WITH_REFRESH_TOKENS = (selectinload(models.User.refresh_tokens),)
+POST_WITH_OWNER = (selectinload(models.Post.owner),)
+
+
+async def create_user(db: AsyncSession, user: UserCreate, hashed_password: str):
     db_user = models.User(
         username=user.username,
         email=user.email,
-        hashed_password=hash_password(user.password),
+        hashed_password=hashed_password,
         role="user"
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    await user_cache.invalidate(db_user.id)
+    await recent_writes.mark(db_user.id)
+    return db_user
+
+
+async def update_user_password_hash(db: AsyncSession, user: models.User, hashed_password: str):
+    user.hashed_password = hashed_password
+    await db.commit()
+    await recent_writes.mark(user.id)
+    return user
+
+
+async def update_user_role(db: AsyncSession, user_id: int, role: str):
+    db_user = await db.get(models.User, int(user_id))
+    if db_user is None:
+        return None
+
+    db_user.role = role
+    await db.commit()
+    await user_cache.invalidate(db_user.id)
+    await recent_writes.mark(db_user.id)
     return db_user
 
 
+# -------------------------------
+# Get user by id
+# -------------------------------
+async def get_user_by_id(db: AsyncSession, user_id: int, options=()):
+    return await db.get(models.User, int(user_id), options=options)
+
+
 # -------------------------------
 # Get user by email
 # -------------------------------
-def get_user_by_email(db: Session, email: str):
-    return (
-        db.query(models.User)
-        .filter(models.User.email == email)
-        .first()
+async def get_user_by_email(db: AsyncSession, email: str, options=()):
+    result = await db.execute(
+        select(models.User)
+        .where(models.User.email == email)
+        .options(*options)
     )
+    return result.scalars().first()
 
 
 # -------------------------------
 # Authenticate user
 # -------------------------------
-def authenticate_user(
-    db: Session,
+async def authenticate_user(
+    db: AsyncSession,
     email: str,
     password: str
 ):
-    user = get_user_by_email(db, email)
+    user = await get_user_by_email(db, email)
     if not user:
         return None
 
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
 
     return user
 
-def get_post_by_id(db:Session,post_id:int):
-    return(
-        db.query(models.Post)
-        .filter(models.Post.id == post_id)
-        .first()
-    )
+async def get_post_by_id(db:AsyncSession,post_id:int,options=()):
+    return await db.get(models.Post, post_id, options=options)
 
-def create_post(
-    db: Session,
+async def create_post(
+    db: AsyncSession,
     title: str,
     content: str,
     owner_id: int
@@ -67,107 +106,313 @@ def create_post(
         owner_id=owner_id
     )
     db.add(post)
-    db.commit()
-    db.refresh(post)
+    await db.commit()
+    await db.refresh(post)
+    await recent_writes.mark(owner_id)
+    await post_list_cache.bump(owner_id)
     return post
 
 
-def get_posts_by_user(
-    db: Session,
-    user_id: int
+async def get_posts_by_user(
+    db: AsyncSession,
+    user_id: int,
+    options=()
 ):
-    return (
-        db.query(models.Post)
-        .filter(models.Post.owner_id == user_id)
-        .all()
+    result = await db.execute(
+        select(models.Post)
+        .where(models.Post.owner_id == user_id)
+        .options(*options)
     )
+    return result.scalars().all()
 
-def delete_post(db:Session,post:models.Post):
-    db.delete(post)
-    db.commit()
+async def delete_post(db:AsyncSession,post:models.Post):
+    await db.delete(post)
+    await db.commit()
+    await recent_writes.mark(post.owner_id)
+    await post_list_cache.bump(post.owner_id)
 
 
-def create_refresh_token(db,token:str,user_id:int,device):
+# -------------------------------
+# Bulk post writes
+# -------------------------------
+async def create_posts_bulk(
+    db: AsyncSession,
+    posts: list[tuple[str, str]],
+    owner_id: int
+):
+    """
+    Inserts (title, content) pairs in one transaction: a single batched
+    INSERT ... RETURNING instead of add/commit/refresh per post. Returns
+    the new posts in input order.
+    """
+    result = await db.scalars(
+        insert(models.Post).returning(models.Post, sort_by_parameter_order=True),
+        [
+            {"title": title, "content": content, "owner_id": owner_id}
+            for title, content in posts
+        ]
+    )
+    created = result.all()
+    await db.commit()
+    await recent_writes.mark(owner_id)
+    await post_list_cache.bump(owner_id)
+    return created
+
+
+async def delete_posts_bulk(
+    db: AsyncSession,
+    post_ids: list[int],
+    user_id: int,
+    is_admin: bool = False
+):
+    """
+    Deletes the given posts in one transaction. Users may only delete their
+    own posts; admins any post. Returns {post_id: "deleted" | "not_found" |
+    "forbidden"}.
+    """
+    owners = dict((await db.execute(
+        select(models.Post.id, models.Post.owner_id)
+        .where(models.Post.id.in_(list(set(post_ids))))
+    )).all())
+
+    allowed = {
+        post_id for post_id, owner_id in owners.items()
+        if is_admin or owner_id == user_id
+    }
+
+    deleted = set()
+    if allowed:
+        query = delete(models.Post).where(models.Post.id.in_(list(allowed)))
+        if not is_admin:
+            query = query.where(models.Post.owner_id == user_id)
+        deleted = set((await db.scalars(
+            query.returning(models.Post.id),
+            execution_options={"synchronize_session": False}
+        )).all())
+    await db.commit()
+
+    for owner_id in {owners[post_id] for post_id in deleted}:
+        await recent_writes.mark(owner_id)
+        await post_list_cache.bump(owner_id)
+
+    results = {}
+    for post_id in post_ids:
+        if post_id in deleted:
+            results[post_id] = "deleted"
+        elif post_id in owners and post_id not in allowed:
+            results[post_id] = "forbidden"
+        else:
+            results[post_id] = "not_found"
+    return results
+
+
+async def create_refresh_token(db,token:str,user_id:int,device):
     db_token=models.RefreshToken(
         token=token,
         user_id=user_id,
         device=device
     )
     db.add(db_token)
-    db.commit()
+    await db.commit()
     return db_token
 
 
-def get_refresh_token(db,token:str):
-    return (
-        db.query(models.RefreshToken)
-        .filter(models.RefreshToken.token==token)
-        .first()
-        )
+async def get_refresh_token(db,token:str):
+    result = await db.execute(
+        select(models.RefreshToken)
+        .where(models.RefreshToken.token==token)
+    )
+    return result.scalars().first()
 
-def delete_refresh_token(db,token:str):
-    db_token=get_refresh_token(db,token)
+async def delete_refresh_token(db,token:str):
+    db_token=await get_refresh_token(db,token)
     if db_token:
-        db.delete(db_token)
-        db.commit()
-
-def blacklist_token(db: Session, token: str):
-    db_token = models.BlacklistedToken(token=token)
-    db.add(db_token)
-    db.commit()
-
-def is_token_blacklisted(db: Session, token: str) -> bool:
-    return db.query(models.BlacklistedToken)\
-             .filter(models.BlacklistedToken.token == token)\
-             .first() is not None
+        await db.delete(db_token)
+        await db.commit()
 
-
-def revoke_refresh_token(db, token):
-    db_token = db.query(models.RefreshToken)\
-        .filter(models.RefreshToken.token == token)\
-        .first()
+async def revoke_refresh_token(db, token):
+    db_token = await get_refresh_token(db, token)
     if db_token:
         db_token.is_revoked = True
-        db.commit()
+        await db.commit()
 
 
-def is_refresh_token_valid(db, token):
-    return db.query(models.RefreshToken)\
-        .filter(
+async def is_refresh_token_valid(db, token):
+    result = await db.execute(
+        select(models.RefreshToken)
+        .where(
             models.RefreshToken.token == token,
             models.RefreshToken.is_revoked == False
-        ).first()
+        )
+    )
+    return result.scalars().first()
+
+# Each needs an (owner_id, <column>, id) index (see models.Post); content is
+# not sortable, an index on post bodies would cost more than it serves
+SORTABLE_POST_COLUMNS = ("id", "title")
+
 
-def get_posts_by_user_paginated(
-    db: Session,
+def post_sort_key(sort: str) -> str:
+    # Unsupported sorts fall back to id
+    return sort if sort in SORTABLE_POST_COLUMNS else "id"
+
+
+def _post_sort_column(sort: str):
+    return getattr(models.Post, post_sort_key(sort))
+
+
+def post_cursor_key(post: models.Post, sort: str):
+    return getattr(post, _post_sort_column(sort).key), post.id
+
+
+async def get_posts_by_user_paginated(
+    db: AsyncSession,
     user_id: int,
     page: int,
     limit: int,
     title: str | None = None,
     sort: str = "id",
-    order: str = "desc"
+    order: str = "desc",
+    include_total: bool = True
 ):
-    query = db.query(models.Post).filter(models.Post.owner_id == user_id)
+    query = select(models.Post).where(models.Post.owner_id == user_id)
 
     # Filtering
     if title:
-        query = query.filter(models.Post.title.ilike(f"%{title}%"))
+        query = query.where(models.Post.title.ilike(f"%{title}%"))
+
+    total = None
+    if include_total:
+        total = await db.scalar(
+            select(func.count()).select_from(query.subquery())
+        )
 
     # Sorting
-    sort_column = getattr(models.Post, sort, models.Post.id)
+    sort_column = _post_sort_column(sort)
 
     if order == "desc":
-        query = query.order_by(sort_column.desc())
+        query = query.order_by(sort_column.desc(), models.Post.id.desc())
     else:
-        query = query.order_by(sort_column.asc())
-
-    total = query.count()
+        query = query.order_by(sort_column.asc(), models.Post.id.asc())
 
-    posts = (
+    result = await db.execute(
         query
         .offset((page - 1) * limit)
         .limit(limit)
-        .all()
     )
+    posts = result.scalars().all()
+
+    return total, posts
+
+
+async def get_posts_by_user_keyset(
+    db: AsyncSession,
+    user_id: int,
+    limit: int,
+    after: tuple | None = None,
+    title: str | None = None,
+    sort: str = "id",
+    order: str = "desc",
+    include_total: bool = False
+):
+    """
+    Cursor pagination: seeks past `after` = (sort_value, id) instead of
+    using OFFSET, so every page costs the same as the first one.
+
+    Returns (total, posts, next_key) where next_key is None on the last page.
+    """
+    query = select(models.Post).where(models.Post.owner_id == user_id)
+
+    if title:
+        query = query.where(models.Post.title.ilike(f"%{title}%"))
+
+    total = None
+    if include_total:
+        total = await db.scalar(
+            select(func.count()).select_from(query.subquery())
+        )
+
+    sort_column = _post_sort_column(sort)
+    descending = order == "desc"
+
+    if after is not None:
+        sort_value, last_id = after
+        if sort_column is models.Post.id:
+            query = query.where(
+                models.Post.id < last_id if descending else models.Post.id > last_id
+            )
+        elif descending:
+            query = query.where(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, models.Post.id < last_id)
+            ))
+        else:
+            query = query.where(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, models.Post.id > last_id)
+            ))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), models.Post.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), models.Post.id.asc())
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    posts = result.scalars().all()
+
+    next_key = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_key = post_cursor_key(posts[-1], sort)
+
+    return total, posts, next_key
+
+# -------------------------------
+# Full-text search
+# -------------------------------
+async def search_posts(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    limit: int,
+    after: tuple | None = None
+):
+    """
+    Ranked full-text search over the user's posts (title and content, see
+    app/db/search.py). Cursor-paginated like get_posts_by_user_keyset, with
+    `after` = (rank, id) of the last hit.
+
+    Returns (hits, next_key): hits is a list of (post, rank), best first.
+    """
+    matches = search.post_matches(db.get_bind().dialect.name, query, user_id)
+    if matches is None:
+        return [], None
+
+    statement = (
+        select(models.Post, matches.c.rank)
+        .join(matches, matches.c.id == models.Post.id)
+        .where(models.Post.owner_id == user_id)
+    )
+
+    if after is not None:
+        rank, last_id = after
+        statement = statement.where(or_(
+            matches.c.rank > rank,
+            and_(matches.c.rank == rank, models.Post.id > last_id)
+        ))
+
+    result = await db.execute(
+        statement
+        .order_by(matches.c.rank.asc(), models.Post.id.asc())
+        .limit(limit + 1)
+    )
+    hits = [tuple(row) for row in result.all()]
+
+    next_key = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        post, rank = hits[-1]
+        next_key = (rank, post.id)
 
-    return total, posts
\ No newline at end of file
+    return hits, next_key
@@ -1,12 +1,108 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import get_settings
+from app.core.metrics import instrument_engine
 
 settings=get_settings()
 
-engine = create_engine(
-    settings.DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+# -------------------------------
+# Engine factory
+# -------------------------------
+SYNC_DRIVERS = {
+    "sqlite": "sqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgres": "postgresql+psycopg",
+}
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    driver = ASYNC_DRIVERS.get(scheme.split("+")[0], scheme)
+    return f"{driver}{sep}{rest}"
+
+
+def get_sync_database_url(url: str) -> str:
+    # An explicitly chosen driver (e.g. postgresql+psycopg2) is kept
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme:
+        return url
+    return f"{SYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def _set_sqlite_pragmas(engine, journal_mode: str):
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def engine_options(url: str, is_async: bool) -> dict:
+    backend = make_url(url).get_backend_name()
+
+    if backend == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        if make_url(url).database not in (None, "", ":memory:"):
+            options.update(
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+            )
+        return options
+
+    options = dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+
+    if backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+
+    return options
+
+
+def create_db_engine(url: str, is_async: bool = False, sqlite_journal_mode: str | None = None):
+    """
+    Builds a pooled engine for `url`, tuned per dialect: pool sizing,
+    pre-ping, recycling and statement timeouts for Postgres; WAL and
+    busy-timeout pragmas for SQLite.
+    """
+    if is_async:
+        url = get_async_database_url(url)
+        engine = create_async_engine(url, **engine_options(url, is_async=True))
+        sync_engine = engine.sync_engine
+    else:
+        url = get_sync_database_url(url)
+        engine = create_engine(url, **engine_options(url, is_async=False))
+        sync_engine = engine
+
+    if sync_engine.dialect.name == "sqlite":
+        _set_sqlite_pragmas(sync_engine, sqlite_journal_mode or settings.SQLITE_JOURNAL_MODE)
+
+    instrument_engine(sync_engine)
+    return engine
+
+
+engine = create_db_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -14,11 +110,38 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+
+# -------------------------------
+# Async engine (used by the API)
+# -------------------------------
+async_engine = create_db_engine(settings.DATABASE_URL, is_async=True)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# -------------------------------
+# Read replica (GET routes, see app/api/deps.get_read_db)
+# -------------------------------
+# Without DATABASE_REPLICA_URL reads share the primary's pool
+replica_engine = (
+    create_db_engine(settings.DATABASE_REPLICA_URL, is_async=True)
+    if settings.DATABASE_REPLICA_URL
+    else async_engine
+)
+
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String,ForeignKey,DateTime,Boolean
+from sqlalchemy import Column, Integer, String,ForeignKey,DateTime,Boolean,Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -11,6 +11,7 @@ class User(Base):
     email = Column(String, unique=True, index=True,nullable=False)
     hashed_password = Column(String,nullable=False)
     role = Column(String, default="user")
+    is_active = Column(Boolean, default=True, nullable=False)
 
     refresh_tokens=relationship("RefreshToken",back_populates="user")
     posts=relationship("Post",back_populates="owner")
@@ -30,21 +31,21 @@ class Post(Base):
         back_populates="posts"
     )
 
+    # Match the filter/sort combinations of get_posts_by_user_paginated:
+    # WHERE owner_id = ? ORDER BY <id | title>, id
+    __table_args__ = (
+        Index("ix_posts_owner_id_id", "owner_id", "id"),
+        Index("ix_posts_owner_id_title", "owner_id", "title", "id"),
+    )
+
 class RefreshToken(Base):
     __tablename__="refresh_tokens"
 
     id=Column(Integer,primary_key=True,index=True)
     token=Column(String,unique=True,index=True)
-    user_id=Column(Integer,ForeignKey("users.id"))
+    user_id=Column(Integer,ForeignKey("users.id"),index=True)
     device=Column(String)
     is_revoked=Column(Boolean,default=False)
     created_at=Column(DateTime,default=datetime.utcnow)
 
     user=relationship("User",back_populates="refresh_tokens")
-
-
-class BlacklistedToken(Base):
-     __tablename__="blacklisted_tokens"
-     id=Column(Integer,primary_key=True,index=True)
-     token=Column(String,unique=True,index=True)
-     created_at=Column(DateTime,default=datetime.utcnow)
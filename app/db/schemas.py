@@ -1,5 +1,9 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import List
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, TypeAdapter
+from typing import List, Literal, Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
 
 # =========================
 # AUTH SCHEMAS
@@ -41,6 +45,7 @@ class TokenResponse(BaseModel):
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
+    username: Optional[str] = None
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -60,6 +65,10 @@ class UserOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserRoleUpdate(BaseModel):
+    role: Literal["user", "admin"]
+
+
 class UserProfileData(BaseModel):
     id: int
     email: EmailStr
@@ -102,6 +111,39 @@ class PostOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+PostOutList = TypeAdapter(List[PostOut])
+
+
+def dump_posts(posts) -> list[dict]:
+    # One pydantic-core call for the whole page instead of a
+    # model_validate + model_dump per row
+    return PostOutList.dump_python(PostOutList.validate_python(posts, from_attributes=True))
+
+
+# Validation stops at the first item past the cap (a 413, see main.py)
+class PostBulkCreate(BaseModel):
+    items: List[PostCreate] = Field(min_length=1, max_length=settings.POST_BULK_MAX_ITEMS)
+
+
+class PostBulkDelete(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=settings.POST_BULK_MAX_ITEMS)
+
+
+class PostBulkItemResult(BaseModel):
+    index: int
+    # "created", "deleted", "not_found" or "forbidden"
+    status: str
+    id: Optional[int] = None
+    post: Optional[PostOut] = None
+
+
+class PostBulkResponse(BaseModel):
+    message: str
+    data: List[PostBulkItemResult]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class PostResponse(BaseModel):
     message: str
     data: PostOut
@@ -137,10 +179,11 @@ class MessageResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 class PaginationMeta(BaseModel):
-    total: int
+    total: Optional[int] = None
     page: int
     limit: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -156,4 +199,31 @@ class PaginatedPostResponse(BaseModel):
     message: str
     data: PaginatedPostData
 
+    model_config = ConfigDict(from_attributes=True)
+
+
+# =========================
+# SEARCH SCHEMAS
+# =========================
+
+class PostSearchHit(PostOut):
+    # Relevance, higher is better; only comparable within one query
+    score: float
+
+
+class PostSearchMeta(BaseModel):
+    query: str
+    limit: int
+    next_cursor: Optional[str] = None
+
+
+class PostSearchData(BaseModel):
+    meta: PostSearchMeta
+    items: List[PostSearchHit]
+
+
+class PostSearchResponse(BaseModel):
+    message: str
+    data: PostSearchData
+
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
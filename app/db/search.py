@@ -0,0 +1,102 @@
+"""
+Full-text search over posts.title and posts.content.
+
+SQLite: an external-content FTS5 table (posts_fts) that triggers keep in
+sync with every insert, update and delete on posts, including the bulk
+paths. owner_id is indexed as a column of its own so MATCH only walks the
+searching user's posts. Postgres: a GIN index over the same to_tsvector()
+expression the search query uses, so there is nothing to keep in sync;
+the owner filter is combined with it through ix_posts_owner_id_id.
+
+The DDL runs after `posts` is created through metadata.create_all and in
+the alembic migration that introduced search.
+"""
+import re
+
+from sqlalchemy import DDL, Float, Integer, event, text
+
+from app.db import models
+
+SEARCH_LANGUAGE = "english"
+MAX_QUERY_TERMS = 16
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, content, owner_id, content='posts', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, content, owner_id) "
+    "VALUES (new.id, new.title, new.content, new.owner_id); END",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content, owner_id) "
+    "VALUES ('delete', old.id, old.title, old.content, old.owner_id); END",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content, owner_id) "
+    "VALUES ('delete', old.id, old.title, old.content, old.owner_id); "
+    "INSERT INTO posts_fts(rowid, title, content, owner_id) "
+    "VALUES (new.id, new.title, new.content, new.owner_id); END",
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS posts_fts_au",
+    "DROP TRIGGER IF EXISTS posts_fts_ad",
+    "DROP TRIGGER IF EXISTS posts_fts_ai",
+    "DROP TABLE IF EXISTS posts_fts",
+)
+
+# Must stay identical to the indexed expression or Postgres will not use it
+POSTGRES_VECTOR = (
+    f"to_tsvector('{SEARCH_LANGUAGE}', "
+    "coalesce(posts.title, '') || ' ' || coalesce(posts.content, ''))"
+)
+
+POSTGRES_DDL = (
+    f"CREATE INDEX IF NOT EXISTS ix_posts_search ON posts USING GIN ({POSTGRES_VECTOR})",
+)
+
+POSTGRES_DROP = (
+    "DROP INDEX IF EXISTS ix_posts_search",
+)
+
+for statement in SQLITE_DDL:
+    event.listen(models.Post.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in SQLITE_DROP:
+    event.listen(models.Post.__table__, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRES_DDL:
+    event.listen(models.Post.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
+def _terms(query: str) -> list[str]:
+    return re.findall(r"\w+", query)[:MAX_QUERY_TERMS]
+
+
+def post_matches(dialect: str, query: str, owner_id: int):
+    """
+    Subquery of (id, rank) for `owner_id`'s posts matching every term of
+    `query`, or None when the query has no searchable terms. Lower rank is
+    a better match on both backends.
+    """
+    terms = _terms(query)
+    if not terms:
+        return None
+
+    if dialect == "postgresql":
+        tsquery = f"plainto_tsquery('{SEARCH_LANGUAGE}', :query)"
+        statement = text(
+            f"SELECT posts.id AS id, -ts_rank_cd({POSTGRES_VECTOR}, {tsquery}) AS rank "
+            f"FROM posts WHERE posts.owner_id = :owner_id AND {POSTGRES_VECTOR} @@ {tsquery}"
+        ).bindparams(query=" ".join(terms), owner_id=owner_id)
+    else:
+        # Quoted terms are literal strings to FTS5, so user input can never
+        # be parsed as query syntax (NEAR, OR, column filters, ...). The
+        # terms only match title and content; owner_id has no rank weight.
+        phrases = " ".join(f'"{term}"' for term in terms)
+        statement = text(
+            "SELECT rowid AS id, bm25(posts_fts, 10.0, 1.0, 0.0) AS rank "
+            "FROM posts_fts WHERE posts_fts MATCH :query"
+        ).bindparams(query=f'owner_id : "{int(owner_id)}" AND {{title content}} : ({phrases})')
+
+    return statement.columns(id=Integer, rank=Float).subquery("matches")
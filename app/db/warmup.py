@@ -0,0 +1,50 @@
+"""
+Worker warm-up, run by the lifespan in app/main.py before the worker takes
+traffic, so the first requests don't pay for connection setup or for
+compiling their SQL.
+"""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db import crud
+from app.db.database import Base, async_engine, replica_engine, AsyncSessionLocal, ReplicaSessionLocal
+
+
+async def create_tables():
+    # Development shortcut (DB_CREATE_TABLES_ON_STARTUP); deployments run
+    # `alembic upgrade head` instead
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def warm_pool(engine: AsyncEngine, connections: int):
+    """Opens `connections` pooled connections by checking them out at once."""
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+
+async def precompile_queries(session_factory):
+    """
+    Runs the hot read paths once with keys that match no rows. Their SQL
+    lands in the engine's compiled statement cache, so real requests skip
+    ORM compilation from the first one on.
+    """
+    async with session_factory() as db:
+        await crud.get_user_by_id(db, 0)  # get_current_user on a user cache miss
+        await crud.get_user_by_email(db, "")  # login
+        await crud.get_posts_by_user_paginated(db, user_id=0, page=1, limit=10)  # /posts/me
+        await crud.get_posts_by_user_keyset(db, user_id=0, limit=10, after=(0, 0), include_total=True)
+        await crud.search_posts(db, user_id=0, query="warmup", limit=10)
+
+
+async def warm_up_database(connections: int):
+    engines = {async_engine: AsyncSessionLocal, replica_engine: ReplicaSessionLocal}
+    for engine, session_factory in engines.items():
+        await warm_pool(engine, connections)
+        await precompile_queries(session_factory)
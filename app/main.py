@@ -1,42 +1,83 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Request, Query, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import asynccontextmanager
 from math import ceil
-import time
 
-from app.db.database import engine, get_db
+from app.db.database import get_db
+from app.db.warmup import create_tables, warm_up_database
 from app.db import models, crud
 from app.db.schemas import (
     PaginatedPostResponse,
     UserCreate,
     UserOut,
     PostCreate,
-    PostOut
+    PostOut,
+    dump_posts,
+    PostBulkCreate,
+    PostBulkDelete,
+    PostBulkResponse,
+    PostSearchResponse
 )
 
 from app.api import auth, users
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_db
 
 from app.core.config import get_settings
 from app.core.response import success_response, error_response
+from app.core.pagination import encode_cursor, decode_cursor
 from app.core.logger import logger
+from app.core.metrics import render_metrics
+from app.core.middleware import RequestIdMiddleware, TimingMiddleware, CompressionMiddleware
+from app.core.rate_limiter import RateLimiter, POST_WRITE_POLICY, POST_BULK_POLICY, POST_SEARCH_POLICY
+from app.core.user_cache import user_cache
+from app.core.recent_writes import recent_writes
+from app.core.post_list_cache import post_list_cache
+from app.core.security import shutdown_password_pool
+from app.core.revocation import revoked_filter
+from app.core.redis import init_redis, close_redis
 
-from app.tasks import send_email_task
+settings = get_settings()
 
 
 # -------------------------------
-# DB Setup
+# Startup / Shutdown (lifespan)
 # -------------------------------
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("🚀 FastAPI application starting...")
+    if settings.DB_CREATE_TABLES_ON_STARTUP:
+        await create_tables()
+    try:
+        await warm_up_database(settings.STARTUP_WARM_CONNECTIONS)
+    except Exception as exc:
+        logger.warning(f"Database warm-up failed: {exc}")
+    try:
+        await init_redis(settings.STARTUP_WARM_CONNECTIONS)
+    except Exception as exc:
+        logger.warning(f"Redis not reachable at startup: {exc}")
+    # Background threads: they keep retrying if Redis is not up yet
+    user_cache.start_listener()
+    recent_writes.start_listener()
+    revoked_filter.start()
+
+    yield
 
-settings = get_settings()
+    logger.info("🛑 FastAPI application shutting down...")
+    user_cache.stop_listener()
+    recent_writes.stop_listener()
+    revoked_filter.stop()
+    shutdown_password_pool()
+    await close_redis()
 
 
 # -------------------------------
 # FastAPI App
 # -------------------------------
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     title="FastAPI Production Backend",
     version="1.0.0",
     description="""
@@ -58,36 +99,12 @@ app = FastAPI(
 
 
 # -------------------------------
-# Startup / Shutdown Events
-# -------------------------------
-@app.on_event("startup")
-async def startup_event():
-    logger.info("🚀 FastAPI application starting...")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("🛑 FastAPI application shutting down...")
-
-
-# -------------------------------
-# Request Logging Middleware
+# Middleware (pure ASGI, see app/core/middleware.py)
 # -------------------------------
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-
-    response = await call_next(request)
-
-    process_time = round(time.time() - start_time, 4)
-
-    logger.info(
-        f"{request.method} {request.url.path} | "
-        f"Status: {response.status_code} | "
-        f"Time: {process_time}s"
-    )
-
-    return response
+# Added innermost first: RequestId -> Timing -> Compression -> routes
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+app.add_middleware(TimingMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+app.add_middleware(RequestIdMiddleware)
 
 
 # -------------------------------
@@ -97,12 +114,20 @@ async def log_requests(request: Request, call_next):
 async def http_exception_handler(request: Request, exc: HTTPException):
     return error_response(
         message=exc.detail,
-        status_code=exc.status_code
+        status_code=exc.status_code,
+        headers=exc.headers
     )
 
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    # A body list over its max_length (the bulk endpoints' cap) is a 413
+    for error in exc.errors():
+        if error["type"] == "too_long" and error["loc"][0] == "body":
+            return error_response(
+                message=f"At most {error['ctx']['max_length']} posts per request",
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE
+            )
     return error_response(
         message="Validation Error",
         status_code=422
@@ -111,8 +136,10 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
+    # The traceback is formatted by the log listener thread, not here
     logger.error(
-        f"Unhandled error on {request.method} {request.url.path}: {str(exc)}"
+        f"Unhandled error on {request.method} {request.url.path}",
+        exc_info=exc
     )
 
     return error_response(
@@ -136,6 +163,12 @@ def root():
     return {"message": "FastAPI Advanced Backend Running 🚀"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/health")
 def health():
     return {"status": "OK", "service": settings.APP_NAME}
@@ -145,17 +178,18 @@ def health():
 # Protected Routes
 # -------------------------------
 @app.get("/me", response_model=UserOut)
-def my_profile(user: models.User = Depends(get_current_user)):
+async def my_profile(user: models.User = Depends(get_current_user)):
     return user
 
 
 @app.post("/posts", response_model=PostOut)
-def create_post(
+async def create_post(
     post: PostCreate,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: models.User = Depends(get_current_user),
+    _: None = Depends(RateLimiter(POST_WRITE_POLICY))
 ):
-    return crud.create_post(
+    return await crud.create_post(
         db=db,
         title=post.title,
         content=post.content,
@@ -163,55 +197,202 @@ def create_post(
     )
 
 
+@app.post(
+    "/posts/bulk",
+    response_model=PostBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create Posts in Bulk"
+)
+async def create_posts_bulk(
+    payload: PostBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    user: models.User = Depends(get_current_user),
+    _: None = Depends(RateLimiter(POST_BULK_POLICY))
+):
+    posts = await crud.create_posts_bulk(
+        db=db,
+        posts=[(item.title, item.content) for item in payload.items],
+        owner_id=user.id
+    )
+
+    return success_response(
+        data=[
+            {
+                "index": index,
+                "status": "created",
+                "id": post["id"],
+                "post": post
+            }
+            for index, post in enumerate(dump_posts(posts))
+        ],
+        message=f"{len(posts)} posts created",
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+@app.delete(
+    "/posts/bulk",
+    response_model=PostBulkResponse,
+    summary="Delete Posts in Bulk"
+)
+async def delete_posts_bulk(
+    payload: PostBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    user: models.User = Depends(get_current_user),
+    _: None = Depends(RateLimiter(POST_BULK_POLICY))
+):
+    results = await crud.delete_posts_bulk(
+        db=db,
+        post_ids=payload.ids,
+        user_id=user.id,
+        is_admin=user.role == "admin"
+    )
+    deleted = sum(1 for result in results.values() if result == "deleted")
+
+    return success_response(
+        data=[
+            {"index": index, "status": results[post_id], "id": post_id, "post": None}
+            for index, post_id in enumerate(payload.ids)
+        ],
+        message=f"{deleted} posts deleted"
+    )
+
+
 @app.get(
     "/posts/me",
     response_model=PaginatedPostResponse,
     summary="Get My Posts (Paginated + Sorted)"
 )
-def my_posts(
+async def my_posts(
+    request: Request,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     title: str | None = None,
     sort: str = Query("id"),
     order: str = Query("desc"),
-    db: Session = Depends(get_db),
+    after: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Set false to skip the COUNT query"),
+    db: AsyncSession = Depends(get_read_db),
     user: models.User = Depends(get_current_user)
 ):
+    # The sort actually applied: cursors and cache entries are keyed on it
+    sort = crud.post_sort_key(sort)
+
+    # Served from Redis until the user's next post write
+    cached = await post_list_cache.lookup(user.id, {
+        "page": page, "limit": limit, "title": title, "sort": sort,
+        "order": order, "after": after, "include_total": include_total
+    })
+    cache_headers = {"ETag": cached.etag, "Cache-Control": "private, no-cache"} if cached else None
+
+    if post_list_cache.not_modified_for(cached, request.headers.get("If-None-Match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    if cached is not None and cached.data is not None:
+        return success_response(
+            data=cached.data,
+            message="Posts fetched successfully",
+            headers=cache_headers
+        )
 
-    total, posts = crud.get_posts_by_user_paginated(
+    # Cursor mode: keyset pagination, deep pages cost the same as page 1
+    if after:
+        total, posts, next_key = await crud.get_posts_by_user_keyset(
+            db=db,
+            user_id=user.id,
+            limit=limit,
+            after=decode_cursor(after, sort),
+            title=title,
+            sort=sort,
+            order=order,
+            include_total=include_total
+        )
+    else:
+        total, posts = await crud.get_posts_by_user_paginated(
+            db=db,
+            user_id=user.id,
+            page=page,
+            limit=limit,
+            title=title,
+            sort=sort,
+            order=order,
+            include_total=include_total
+        )
+        next_key = crud.post_cursor_key(posts[-1], sort) if len(posts) == limit else None
+
+    next_cursor = encode_cursor(sort, *next_key) if next_key else None
+
+    if total is None:
+        total_pages = None
+    else:
+        total_pages = ceil(total / limit) if total > 0 else 1
+
+    data = {
+        "meta": {
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "total_pages": total_pages,
+            "next_cursor": next_cursor
+        },
+        "items": dump_posts(posts)
+    }
+
+    if cached is not None:
+        await post_list_cache.store(cached, data)
+
+    return success_response(
+        data=data,
+        message="Posts fetched successfully",
+        headers=cache_headers
+    )
+
+
+@app.get(
+    "/posts/search",
+    response_model=PostSearchResponse,
+    summary="Search My Posts (Full-Text, Ranked)"
+)
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match in title or content"),
+    limit: int = Query(10, ge=1, le=100),
+    after: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    db: AsyncSession = Depends(get_read_db),
+    user: models.User = Depends(get_current_user),
+    _: None = Depends(RateLimiter(POST_SEARCH_POLICY))
+):
+    hits, next_key = await crud.search_posts(
         db=db,
         user_id=user.id,
-        page=page,
+        query=q,
         limit=limit,
-        title=title,
-        sort=sort,
-        order=order
+        after=decode_cursor(after, "rank") if after else None
     )
 
-    total_pages = ceil(total / limit) if total > 0 else 1
-
     return success_response(
         data={
             "meta": {
-                "total": total,
-                "page": page,
+                "query": q,
                 "limit": limit,
-                "total_pages": total_pages
+                "next_cursor": encode_cursor("rank", *next_key) if next_key else None
             },
-            "items": posts
+            "items": [
+                {**item, "score": -rank}
+                for item, (_, rank) in zip(dump_posts([post for post, _ in hits]), hits)
+            ]
         },
-        message="Posts fetched successfully"
+        message="Search results fetched successfully"
     )
 
 
 @app.delete("/posts/{post_id}")
-def delete_post(
+async def delete_post(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: models.User = Depends(get_current_user)
 ):
 
-    post = crud.get_post_by_id(db, post_id)
+    post = await crud.get_post_by_id(db, post_id)
 
     if not post:
         raise HTTPException(
@@ -225,7 +406,7 @@ def delete_post(
             detail="Not allowed"
         )
 
-    crud.delete_post(db, post_id)
+    await crud.delete_post(db, post)
 
     return {"message": "Post deleted successfully"}
 
@@ -249,6 +430,8 @@ def send_email_background(background_tasks: BackgroundTasks):
 # -------------------------------
 @app.post("/send-email")
 def send_email(email: str):
+    # Celery and the broker client load on the first enqueue, not at boot
+    from app.tasks import send_email_task
 
     send_email_task.delay(email)
 
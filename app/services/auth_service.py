@@ -1,9 +1,9 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from datetime import timedelta
 from app.db import crud
 from app.core.security import (
-    verify_password,
+    verify_and_update_password_async,
     create_access_token,
     create_refresh_token,
 )
@@ -11,15 +11,30 @@ from app.core.config import get_settings
 
 settings = get_settings()
 
-def login_user(db: Session, email: str, password: str):
-    user = crud.get_user_by_email(db, email)
+async def login_user(db: AsyncSession, email: str, password: str):
+    user = await crud.get_user_by_email(db, email)
 
-    if not user or not verify_password(password, user.hashed_password):
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
 
+    valid, new_hash = await verify_and_update_password_async(
+        password, user.hashed_password
+    )
+
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    # Stored hash predates the current hashing profile: upgrade it now that
+    # we know the plaintext
+    if new_hash:
+        await crud.update_user_password_hash(db, user, new_hash)
+
     access_token = create_access_token(
         data={"sub": str(user.id), "role": user.role}
     )
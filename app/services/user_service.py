@@ -1,10 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.db import crud
 from app.db.schemas import UserCreate
+from app.core.security import hash_password_async
 
-def register_user(db: Session, user: UserCreate):
-    existing_user = crud.get_user_by_email(db, user.email)
+async def register_user(db: AsyncSession, user: UserCreate):
+    existing_user = await crud.get_user_by_email(db, user.email)
 
     if existing_user:
         raise HTTPException(
@@ -12,4 +13,6 @@ def register_user(db: Session, user: UserCreate):
             detail="Email already registered"
         )
 
-    return crud.create_user(db, user)
\ No newline at end of file
+    hashed_password = await hash_password_async(user.password)
+
+    return await crud.create_user(db, user, hashed_password)
\ No newline at end of file
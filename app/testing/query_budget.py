@@ -0,0 +1,105 @@
+"""
+pytest plugin: fail tests whose requests run more SQL than their budget.
+
+Enable it with `-p app.testing.query_budget` or, in a conftest.py,
+`pytest_plugins = ["app.testing.query_budget"]`. Every request a test
+makes through the app (TestClient or httpx ASGITransport) is checked
+against, in order of precedence:
+
+    @pytest.mark.query_budget(3, route="/posts/me")   # one route
+    @pytest.mark.query_budget(5)                      # every route in the test
+
+    # pytest.ini / [tool.pytest.ini_options]
+    query_budgets =
+        GET /posts/me 3
+        POST /posts/bulk 2
+    query_budget_default = 10
+
+Routes are the route templates (/posts/{post_id}), as in the metrics.
+The plugin profiles every request, so a failure lists the statements
+that ran and which of them repeated (N+1 candidates).
+"""
+import pytest
+
+from app.core.query_profiler import query_profiler
+
+# Parsed ini settings, kept on config.stash
+_budgets_key = pytest.StashKey[dict[tuple[str, str], int]]()
+_default_budget_key = pytest.StashKey[int | None]()
+
+
+def pytest_addoption(parser):
+    parser.addini(
+        "query_budgets",
+        "Per-endpoint SQL budgets, one 'METHOD /route max_queries' per line",
+        type="linelist",
+        default=[],
+    )
+    parser.addini(
+        "query_budget_default",
+        "SQL budget for requests no other budget covers (empty: unlimited)",
+        default="",
+    )
+
+
+def _parse_budgets(lines) -> dict[tuple[str, str], int]:
+    budgets = {}
+    for line in lines:
+        try:
+            method, route, limit = line.split()
+            budgets[method.upper(), route] = int(limit)
+        except ValueError:
+            raise pytest.UsageError(f"query_budgets: expected 'METHOD /route max_queries', got {line!r}")
+    return budgets
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries, route=None): fail if a request (to `route`) runs more SQL statements",
+    )
+    default = config.getini("query_budget_default")
+    config.stash[_budgets_key] = _parse_budgets(config.getini("query_budgets"))
+    config.stash[_default_budget_key] = int(default) if default else None
+    # Record statements for every request so failures can show them
+    query_profiler.sample_rate = 1.0
+
+
+def _budget_for(item, profile) -> int | None:
+    for marker in item.iter_markers("query_budget"):
+        route = marker.kwargs.get("route")
+        if route is None or route == profile.route:
+            return marker.args[0] if marker.args else marker.kwargs["max_queries"]
+    budget = item.config.stash[_budgets_key].get((profile.method, profile.route))
+    if budget is not None:
+        return budget
+    return item.config.stash[_default_budget_key]
+
+
+def _describe(profile, budget: int) -> str:
+    lines = [f"{profile.method} {profile.route}: {profile.query_count} queries (budget {budget})"]
+    for statement, count in profile.statements.most_common():
+        flag = "  <- N+1 candidate" if (statement, count) in profile.n_plus_one else ""
+        lines.append(f"    {count} x {statement}{flag}")
+    return "\n".join(lines)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    profiles = []
+    observer = profiles.append
+    query_profiler.subscribe(observer)
+    try:
+        result = yield
+    finally:
+        query_profiler.unsubscribe(observer)
+
+    over_budget = []
+    for profile in profiles:
+        budget = _budget_for(item, profile)
+        if budget is not None and profile.query_count > budget:
+            over_budget.append(_describe(profile, budget))
+
+    if over_budget:
+        pytest.fail("Query budget exceeded:\n" + "\n".join(over_budget), pytrace=False)
+    return result
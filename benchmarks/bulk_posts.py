@@ -0,0 +1,90 @@
+"""
+Throughput of the bulk post endpoints' crud path versus one post at a time.
+
+Creates and deletes the same number of posts through crud.create_post /
+crud.delete_post (a commit per post) and through crud.create_posts_bulk /
+crud.delete_posts_bulk (one transaction per batch) on a fresh SQLite file.
+
+    python -m benchmarks.bulk_posts [posts] [batch_size]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from app.db import crud, models
+from app.db.database import Base, create_db_engine
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_db_engine(f"sqlite:///{path}", is_async=True)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with Session() as db:
+        user = models.User(email="bench@example.com", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        user_id = user.id
+
+    payload = [(f"post {i}", "x" * 200) for i in range(count)]
+
+    async with Session() as db:
+        started = time.perf_counter()
+        posts = [
+            await crud.create_post(db, title, content, user_id)
+            for title, content in payload
+        ]
+        single_create = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for post in posts:
+            await crud.delete_post(db, post)
+        single_delete = time.perf_counter() - started
+
+        started = time.perf_counter()
+        ids = []
+        for i in range(0, count, batch_size):
+            created = await crud.create_posts_bulk(db, payload[i:i + batch_size], user_id)
+            ids += [post.id for post in created]
+        bulk_create = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for i in range(0, count, batch_size):
+            await crud.delete_posts_bulk(db, ids[i:i + batch_size], user_id)
+        bulk_delete = time.perf_counter() - started
+
+        remaining = await db.scalar(select(func.count()).select_from(models.Post))
+
+    await engine.dispose()
+
+    rows = [
+        ("create, one per request", single_create),
+        (f"create, bulk x{batch_size}", bulk_create),
+        ("delete, one per request", single_delete),
+        (f"delete, bulk x{batch_size}", bulk_delete),
+    ]
+    print(f"{count} posts\n")
+    print(f"{'path':<28}{'posts/s':>12}{'total s':>10}")
+    for name, seconds in rows:
+        print(f"{name:<28}{count / seconds:>12.0f}{seconds:>10.2f}")
+    print(f"\nspeedup: create {single_create / bulk_create:.1f}x, "
+          f"delete {single_delete / bulk_delete:.1f}x")
+
+    if remaining:
+        print(f"FAIL: {remaining} posts left behind")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+Sign/verify throughput per JWT backend, bypassing the claims cache.
+
+    python -m benchmarks.jwt_backends [iterations]
+"""
+import sys
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from app.core.jwt_backends import AsymmetricBackend, JoseBackend
+
+
+def build_backends():
+    return [
+        JoseBackend("benchmark-secret", "HS256"),
+        AsymmetricBackend(
+            "EdDSA",
+            public_keys={},
+            private_keys={"bench": ed25519.Ed25519PrivateKey.generate()},
+            active_kid="bench",
+        ),
+        AsymmetricBackend(
+            "ES256",
+            public_keys={},
+            private_keys={"bench": ec.generate_private_key(ec.SECP256R1())},
+            active_kid="bench",
+        ),
+    ]
+
+
+def ops_per_sec(fn, arg, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    claims = {"sub": "1", "role": "user", "exp": int(time.time()) + 3600}
+
+    print(f"{'backend':<22} {'sign ops/s':>12} {'verify ops/s':>14} {'token bytes':>12}")
+    for backend in build_backends():
+        token = backend.encode(dict(claims))
+        assert backend.decode(token)["sub"] == "1"
+
+        sign = ops_per_sec(lambda c: backend.encode(dict(c)), claims, iterations)
+        verify = ops_per_sec(backend.decode, token, iterations)
+        print(f"{backend.name:<22} {sign:>12,.0f} {verify:>14,.0f} {len(token):>12}")
+
+
+if __name__ == "__main__":
+    main()
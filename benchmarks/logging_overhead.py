@@ -0,0 +1,103 @@
+"""
+Requests/sec through the full middleware stack with logging on and off.
+
+Drives GET /health in-process (httpx ASGITransport, no network) with
+concurrent clients under four setups:
+
+  off         access logs disabled (level WARNING)
+  sync        the previous setup: a StreamHandler writing on the event loop
+  queue       app.core.logger's QueueHandler + background listener
+  *-stalled   the same two, with a sink that blocks 2 ms per write
+              (slow disk, full stdout pipe)
+
+    python -m benchmarks.logging_overhead [requests] [concurrency]
+"""
+import asyncio
+import io
+import logging
+import sys
+import time
+
+import httpx
+
+from app.core import logger as app_logger
+from app.main import app
+
+
+class StalledSink(io.StringIO):
+    def write(self, s):
+        time.sleep(0.002)
+        return len(s)
+
+
+class NullSink(io.StringIO):
+    def write(self, s):
+        return len(s)
+
+
+def configure(mode: str, sink):
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+    if mode == "off":
+        root.setLevel(logging.WARNING)
+        return None
+    if mode == "sync":
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s"))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        return None
+
+    _, listener = app_logger.setup_logger(level="INFO", fmt="json", stream=sink)
+    return listener
+
+
+async def run(requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(requests))
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get("/health")
+                assert response.status_code == 200
+
+        await client.get("/health")
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    app_logger.log_listener.stop()
+
+    setups = [
+        ("off", "off", NullSink()),
+        ("sync", "sync", NullSink()),
+        ("queue", "queue", NullSink()),
+        ("sync-stalled", "sync", StalledSink()),
+        ("queue-stalled", "queue", StalledSink()),
+    ]
+
+    results = []
+    for name, mode, sink in setups:
+        listener = configure(mode, sink)
+        rps = await run(requests, concurrency)
+        if listener is not None:
+            listener.stop()
+        results.append((name, rps))
+
+    configure("off", None)
+    print(f"GET /health, {requests} requests, {concurrency} concurrent\n")
+    print(f"{'setup':<16}{'req/s':>10}")
+    for name, rps in results:
+        print(f"{name:<16}{rps:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
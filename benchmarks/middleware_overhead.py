@@ -0,0 +1,143 @@
+"""
+Per-request cost of the middleware stack.
+
+Drives GET /health and GET /posts/me in-process (httpx ASGITransport, no
+network) with the app's routes behind three stacks:
+
+  none    no middleware at all (the floor)
+  before  the previous @app.middleware("http") log_requests, i.e. the same
+          work inside Starlette's BaseHTTPMiddleware
+  after   RequestIdMiddleware + TimingMiddleware + CompressionMiddleware
+          (app/core/middleware.py)
+
+Requests send Accept-Encoding: identity so both stacks return the same
+bytes; "after" still pays for the encoding negotiation. Access logs are
+built but not written (level WARNING). Uses the DATABASE_URL/REDIS_URL
+from the environment; run without Redis to keep its latency out of the
+/posts/me numbers (the post list cache fails open).
+
+    python -m benchmarks.middleware_overhead [requests] [concurrency]
+"""
+import asyncio
+import logging
+import sys
+import time
+import uuid
+
+import httpx
+from fastapi import Request
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core import logger as app_logger
+from app.core.logger import logger, request_id_var, should_log_request
+from app.core.metrics import start_request, observe_request, route_template
+from app.core.security import create_access_token
+from app.db import crud, models
+from app.db.database import AsyncSessionLocal, async_engine
+from app.db.warmup import create_tables
+from app.main import app
+
+
+async def log_requests(request: Request, call_next):
+    stats = start_request()
+    request_id = request.headers.get("X-Request-ID", "")[:128] or uuid.uuid4().hex
+    request_id_var.set(request_id)
+
+    response = await call_next(request)
+
+    rate_limit_headers = getattr(request.state, "rate_limit_headers", None)
+    if rate_limit_headers:
+        response.headers.update(rate_limit_headers)
+    response.headers["X-Request-ID"] = request_id
+
+    process_time = observe_request(request.scope, request.method, response.status_code, stats)
+
+    if should_log_request(response.status_code):
+        logger.info(
+            f"{request.method} {request.url.path} {response.status_code}",
+            extra={"fields": {
+                "method": request.method,
+                "path": request.url.path,
+                "route": route_template(request.scope),
+                "status": response.status_code,
+                "duration_ms": round(process_time * 1000, 2),
+                "db_queries": stats.db_queries,
+                "redis_calls": stats.redis_calls,
+            }}
+        )
+
+    return response
+
+
+def use_stack(stack: list[Middleware]):
+    app.user_middleware = stack
+    app.middleware_stack = None  # rebuilt on the next request
+
+
+async def seed() -> str:
+    await create_tables()
+    async with AsyncSessionLocal() as db:
+        user = await crud.get_user_by_email(db, "middleware-bench@example.com")
+        if user is None:
+            user = models.User(email="middleware-bench@example.com", hashed_password="x")
+            db.add(user)
+            await db.commit()
+            await crud.create_posts_bulk(
+                db, [(f"post {i}", "x" * 200) for i in range(20)], user.id
+            )
+    return create_access_token({"sub": str(user.id)})
+
+
+async def run(client: httpx.AsyncClient, path: str, headers: dict, requests: int, concurrency: int) -> float:
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.get(path, headers=headers)
+            assert response.status_code == 200, response.status_code
+
+    for _ in range(50):
+        await client.get(path, headers=headers)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    app_logger.log_listener.stop()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    token = await seed()
+    auth = {"Authorization": f"Bearer {token}", "Accept-Encoding": "identity"}
+    targets = [("/health", {"Accept-Encoding": "identity"}), ("/posts/me?limit=20", auth)]
+
+    stacks = [
+        ("none", []),
+        ("before", [Middleware(BaseHTTPMiddleware, dispatch=log_requests)]),
+        ("after", list(app.user_middleware)),
+    ]
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, stack in stacks:
+            use_stack(stack)
+            for path, headers in targets:
+                results[name, path] = await run(client, path, headers, requests, concurrency)
+    # aiosqlite's connection threads keep the interpreter alive otherwise
+    await async_engine.dispose()
+
+    print(f"{requests} requests per cell, {concurrency} concurrent\n")
+    print(f"{'path':<22}" + "".join(f"{name:>10}" for name, _ in stacks) + f"{'saved':>10}")
+    for path, _ in targets:
+        row = [results[name, path] for name, _ in stacks]
+        print(f"{path:<22}" + "".join(f"{us:>10.1f}" for us in row) + f"{row[1] - row[2]:>10.1f}")
+    print("\nus/request; saved = before - after")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
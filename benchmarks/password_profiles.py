@@ -0,0 +1,54 @@
+"""
+Per-profile password verify latency on this machine.
+
+Use it to pick BCRYPT_ROUNDS / ARGON2_* so that verify latency, and with it
+p99 login latency, stays within budget.
+
+    python -m benchmarks.password_profiles [samples]
+"""
+import statistics
+import sys
+import time
+
+from app.core.security import build_pwd_context
+
+PROFILES = [
+    ("bcrypt rounds=10", dict(scheme="bcrypt", bcrypt_rounds=10)),
+    ("bcrypt rounds=11", dict(scheme="bcrypt", bcrypt_rounds=11)),
+    ("bcrypt rounds=12", dict(scheme="bcrypt", bcrypt_rounds=12)),
+    ("bcrypt rounds=13", dict(scheme="bcrypt", bcrypt_rounds=13)),
+    ("argon2id m=19MiB t=2 p=1", dict(scheme="argon2", argon2_memory_cost=19456, argon2_time_cost=2, argon2_parallelism=1)),
+    ("argon2id m=64MiB t=3 p=4", dict(scheme="argon2", argon2_memory_cost=65536, argon2_time_cost=3, argon2_parallelism=4)),
+    ("argon2id m=128MiB t=3 p=4", dict(scheme="argon2", argon2_memory_cost=131072, argon2_time_cost=3, argon2_parallelism=4)),
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    password = "correct horse battery staple"
+
+    print(f"{'profile':<28} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, params in PROFILES:
+        context = build_pwd_context(**params)
+        hashed = context.hash(password)
+
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            context.verify(password, hashed)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        print(
+            f"{label:<28} {statistics.median(timings):>8.1f} "
+            f"{percentile(timings, 99):>8.1f} {max(timings):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Full-text search (GET /posts/search) versus the ILIKE filter of /posts/me.
+
+Fills a SQLite file with synthetic posts (Zipf-distributed vocabulary, a
+handful of owners) through the normal schema, so the FTS5 triggers index
+every row, then times one page (limit 10) of:
+
+  ilike title      crud.get_posts_by_user_paginated(title=term), today's path
+  ilike title+body the same scan extended to content, i.e. equal coverage
+  fts              crud.search_posts, ranked
+
+for common, mid-frequency and rare terms.
+
+    python -m benchmarks.post_search [posts] [owners] [db_path]
+
+The database is reused when db_path already exists.
+"""
+import asyncio
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from app.db import crud, models
+from app.db.database import Base, create_db_engine
+
+VOCABULARY_SIZE = 20_000
+RUNS = 5
+
+
+def make_vocabulary(rng: random.Random) -> list[str]:
+    syllables = ["ka", "lo", "mi", "ren", "tu", "sa", "vel", "dor", "pi", "xen", "qua", "bre"]
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def populate(url: str, posts: int, owners: int, vocabulary: list[str], rng: random.Random):
+    engine = create_db_engine(url)
+    Base.metadata.create_all(bind=engine)
+
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    batch = 10_000
+
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [
+            {"email": f"user{i}@example.com", "hashed_password": "x", "role": "user", "is_active": True}
+            for i in range(owners)
+        ])
+
+    started = time.perf_counter()
+    for offset in range(0, posts, batch):
+        rows = []
+        for i in range(offset, min(offset + batch, posts)):
+            words = rng.choices(vocabulary, cum_weights=cum_weights, k=60)
+            rows.append({
+                "title": " ".join(words[:6]),
+                "content": " ".join(words[6:]),
+                "owner_id": i % owners + 1,
+            })
+        with engine.begin() as conn:
+            conn.execute(models.Post.__table__.insert(), rows)
+        print(f"\r  inserted {min(offset + batch, posts):,}/{posts:,}", end="", flush=True)
+    print(f"  ({time.perf_counter() - started:.0f}s)")
+    engine.dispose()
+
+
+async def ilike_everywhere(db, user_id: int, term: str, limit: int):
+    result = await db.execute(
+        select(models.Post)
+        .where(models.Post.owner_id == user_id)
+        .where(or_(
+            models.Post.title.ilike(f"%{term}%"),
+            models.Post.content.ilike(f"%{term}%"),
+        ))
+        .order_by(models.Post.id.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def timed(fn) -> float:
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    posts = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    owners = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    path = sys.argv[3] if len(sys.argv) > 3 else os.path.join(tempfile.mkdtemp(), "search.db")
+
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng)
+
+    if not os.path.exists(path):
+        print(f"Building {posts:,} posts for {owners} owners in {path}")
+        populate(f"sqlite:///{path}", posts, owners, vocabulary, rng)
+
+    engine = create_db_engine(f"sqlite:///{path}", is_async=True)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    terms = {
+        "common": vocabulary[0],
+        "mid": vocabulary[500],
+        "rare": vocabulary[-1],
+        "absent": "zzzzqq",
+    }
+
+    print(f"\nmedian ms for one page of 10 ({RUNS} runs, owner 1 of {owners})\n")
+    print(f"{'term':<10}{'ilike title':>14}{'ilike title+body':>18}{'fts':>10}")
+    async with Session() as db:
+        for label, term in terms.items():
+            title_ms = await timed(lambda: crud.get_posts_by_user_paginated(
+                db, user_id=1, page=1, limit=10, title=term, include_total=False
+            ))
+            everywhere_ms = await timed(lambda: ilike_everywhere(db, 1, term, 10))
+            fts_ms = await timed(lambda: crud.search_posts(db, user_id=1, query=term, limit=10))
+            print(f"{label:<10}{title_ms:>14.1f}{everywhere_ms:>18.1f}{fts_ms:>10.1f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
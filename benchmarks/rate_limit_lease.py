@@ -0,0 +1,55 @@
+"""
+Redis traffic and accuracy of the leased (two-tier) rate limiter.
+
+Simulates several gunicorn workers, each with its own LeasedLimiter, sharing
+one global limit, and compares Redis calls against the one-call-per-request
+sliding window.
+
+    python -m benchmarks.rate_limit_lease [requests] [workers] [lease_size] [overshoot]
+"""
+import asyncio
+import random
+import sys
+import uuid
+
+from app.core.rate_limiter import LeasedLimiter, RateLimitPolicy
+from app.core.redis import async_redis_client
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    lease_size = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    overshoot = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+    limit = requests // 2
+
+    policy = RateLimitPolicy(
+        name=f"bench-{uuid.uuid4().hex[:8]}",
+        limit=limit,
+        window_seconds=3600,
+        lease_size=lease_size,
+        max_overshoot=overshoot,
+        lease_ttl_seconds=60,
+    )
+    limiters = [LeasedLimiter() for _ in range(workers)]
+
+    results = await asyncio.gather(*(
+        random.choice(limiters).hit(policy, "shared-client")
+        for _ in range(requests)
+    ))
+
+    admitted = sum(result.allowed for result in results)
+    redis_calls = sum(limiter.lease_requests for limiter in limiters)
+
+    print(f"requests:           {requests} over {workers} workers")
+    print(f"global limit:       {limit} (lease {lease_size}, max overshoot {overshoot})")
+    print(f"admitted:           {admitted} ({admitted - limit:+d} vs limit)")
+    print(f"redis calls:        {redis_calls} vs {requests} for the sliding window "
+          f"({requests / max(redis_calls, 1):.0f}x fewer)")
+
+    await async_redis_client.delete(f"rate_limit:bucket:{policy.name}:shared-client")
+    await async_redis_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
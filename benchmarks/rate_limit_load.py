@@ -0,0 +1,61 @@
+"""
+Load test for the Lua sliding-window rate limiter against a real Redis.
+
+Fires N concurrent clients at one key and checks that exactly `limit`
+requests are admitted and that each check costs one Redis round-trip.
+
+    python -m benchmarks.rate_limit_load [clients] [limit]
+"""
+import asyncio
+import sys
+import time
+import uuid
+
+from app.core.rate_limiter import RateLimitPolicy, hit
+from app.core.redis import async_redis_client
+
+
+async def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    policy = RateLimitPolicy(name=f"bench-{uuid.uuid4().hex[:8]}", limit=limit, window_seconds=60)
+
+    # Count every command sent to Redis
+    round_trips = 0
+    execute_command = async_redis_client.execute_command
+
+    async def counting_execute_command(*args, **kwargs):
+        nonlocal round_trips
+        round_trips += 1
+        return await execute_command(*args, **kwargs)
+
+    async_redis_client.execute_command = counting_execute_command
+
+    # Load the script once so the run below is pure EVALSHA
+    await hit(policy, "warmup")
+    round_trips = 0
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(hit(policy, "shared-client") for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    admitted = sum(result.allowed for result in results)
+    ok = admitted == limit and round_trips == clients
+    print(f"clients:          {clients}")
+    print(f"limit:            {limit}")
+    print(f"admitted:         {admitted}")
+    print(f"rejected:         {clients - admitted}")
+    print(f"redis round-trips: {round_trips} ({round_trips / clients:.2f} per request)")
+    print(f"throughput:       {clients / elapsed:,.0f} checks/s")
+
+    await async_redis_client.delete(
+        f"rate_limit:{policy.name}:shared-client", f"rate_limit:{policy.name}:warmup"
+    )
+    await async_redis_client.aclose()
+
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,78 @@
+"""
+Cost of serializing a page of posts into a success_response.
+
+Compares, per response, for pages of ORM Post rows:
+
+  before  model_validate + model_dump per row, stdlib JSONResponse and a
+          datetime.utcnow().isoformat() per response
+  after   dump_posts (one TypeAdapter call per page), ORJSONResponse and
+          the per-second cached timestamp (app.core.response)
+
+    python -m benchmarks.response_serialization [items] [iterations]
+"""
+import sys
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+
+from app.core.response import success_response
+from app.db import models
+from app.db.schemas import PostOut, dump_posts
+
+
+def before(posts):
+    return JSONResponse(content={
+        "success": True,
+        "message": "Posts fetched successfully",
+        "data": {
+            "meta": {"total": None, "page": 1, "limit": len(posts), "total_pages": None, "next_cursor": None},
+            "items": [PostOut.model_validate(post).model_dump() for post in posts],
+        },
+        "timestamp": datetime.utcnow().isoformat(),
+    })
+
+
+def after(posts):
+    return success_response(
+        data={
+            "meta": {"total": None, "page": 1, "limit": len(posts), "total_pages": None, "next_cursor": None},
+            "items": dump_posts(posts),
+        },
+        message="Posts fetched successfully",
+    )
+
+
+def bench(fn, posts, iterations: int) -> float:
+    fn(posts)  # warm-up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(posts)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    posts = [
+        models.Post(id=i, title=f"Post title {i}", content="Lorem ipsum dolor sit amet. " * 8, owner_id=1)
+        for i in range(items)
+    ]
+
+    old_body = before(posts).body
+    new_body = after(posts).body
+    assert len(old_body) > 0 and len(new_body) > 0
+
+    before_us = bench(before, posts, iterations)
+    after_us = bench(after, posts, iterations)
+
+    print(f"{items}-item page, {iterations} iterations\n")
+    print(f"{'path':<10}{'us/response':>14}{'bytes':>10}")
+    print(f"{'before':<10}{before_us:>14.1f}{len(old_body):>10}")
+    print(f"{'after':<10}{after_us:>14.1f}{len(new_body):>10}")
+    print(f"\nspeedup: {before_us / after_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
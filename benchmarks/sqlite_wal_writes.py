@@ -0,0 +1,80 @@
+"""
+Concurrent post writes on SQLite: WAL versus the rollback journal.
+
+Runs the real crud.create_post through engines built by create_db_engine,
+once per journal mode, with many writers committing at the same time
+against a fresh database file.
+
+    python -m benchmarks.sqlite_wal_writes [writers] [posts_per_writer]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from app.db import crud, models
+from app.db.database import Base, create_db_engine
+
+
+async def run(journal_mode: str, writers: int, posts_per_writer: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_db_engine(
+        f"sqlite:///{path}", is_async=True, sqlite_journal_mode=journal_mode
+    )
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        mode = (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar()
+
+    async with Session() as db:
+        user = models.User(email="bench@example.com", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        user_id = user.id
+
+    latencies = []
+
+    async def writer(n: int):
+        async with Session() as db:
+            for i in range(posts_per_writer):
+                started = time.perf_counter()
+                await crud.create_post(db, f"w{n}-{i}", "x" * 200, user_id)
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(n) for n in range(writers)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    latencies.sort()
+    total = writers * posts_per_writer
+    return {
+        "mode": mode,
+        "writes": total,
+        "seconds": elapsed,
+        "writes_per_sec": total / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main():
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    posts_per_writer = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    print(f"{writers} concurrent writers x {posts_per_writer} posts\n")
+    print(f"{'journal_mode':<14}{'writes/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'total s':>10}")
+    for journal_mode in ("delete", "wal"):
+        r = await run(journal_mode, writers, posts_per_writer)
+        print(
+            f"{r['mode']:<14}{r['writes_per_sec']:>10.0f}{r['p50_ms']:>10.2f}"
+            f"{r['p99_ms']:>10.2f}{r['seconds']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
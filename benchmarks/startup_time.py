@@ -0,0 +1,116 @@
+"""
+Worker boot cost: import time of app.main and time to first response.
+
+  import   `python -X importtime -c "import app.main"` in a fresh
+           interpreter; the total and the packages that take longest
+           (summed self time of their modules)
+  first    wall time from spawning `uvicorn app.main:app` to the first
+           200 from GET /health (imports + lifespan startup + one request)
+
+Each is measured `runs` times in new processes; medians are reported.
+With --json a single JSON object is printed instead, for CI to record.
+Uses DATABASE_URL/REDIS_URL from the environment like the app.
+
+    python -m benchmarks.startup_time [runs] [--json]
+"""
+import json
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def import_profile() -> tuple[float, dict[str, float]]:
+    """Returns (total ms, {top-level package: ms})."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    packages = defaultdict(int)
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, _, module = match.groups()
+        total_us += int(self_us)
+        packages[module.split(".")[0]] += int(self_us)
+    return total_us / 1000, {name: us / 1000 for name, us in packages.items()}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_response(timeout: float = 60.0) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client() as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return (time.perf_counter() - started) * 1000
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with {server.returncode}")
+                time.sleep(0.005)
+        raise TimeoutError(f"no response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    as_json = "--json" in sys.argv
+    runs = int(args[0]) if args else 5
+
+    import_totals, first_responses = [], []
+    packages = defaultdict(list)
+    for _ in range(runs):
+        total, per_package = import_profile()
+        import_totals.append(total)
+        for name, ms in per_package.items():
+            packages[name].append(ms)
+        first_responses.append(time_to_first_response())
+
+    slowest = sorted(
+        ((name, statistics.median(times)) for name, times in packages.items()),
+        key=lambda item: item[1], reverse=True,
+    )[:12]
+    result = {
+        "runs": runs,
+        "import_ms": round(statistics.median(import_totals), 1),
+        "first_response_ms": round(statistics.median(first_responses), 1),
+        "slowest_imports_ms": {name: round(ms, 1) for name, ms in slowest},
+    }
+
+    if as_json:
+        print(json.dumps(result))
+        return
+
+    print(f"median of {runs} runs, python {sys.version.split()[0]}\n")
+    print(f"import app.main        {result['import_ms']:>8.1f} ms")
+    print(f"first /health response {result['first_response_ms']:>8.1f} ms\n")
+    print(f"{'package':<24}{'ms':>10}")
+    for name, ms in slowest:
+        print(f"{name:<24}{ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
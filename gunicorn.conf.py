@@ -0,0 +1,19 @@
+# Loaded automatically by gunicorn from the working directory.
+import glob
+import os
+
+
+def on_starting(server):
+    # Metric files left over from a previous run would be summed into /metrics
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
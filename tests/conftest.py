@@ -0,0 +1,71 @@
+import os
+import tempfile
+
+# Settings are read at import time: give the app a throwaway database and a
+# Redis URL nothing listens on (Redis-backed features fail open)
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+os.environ.setdefault("REDIS_URL", "redis://127.0.0.1:1/0")
+
+import asyncio
+import uuid
+
+import pytest
+
+pytest_plugins = ["pytester", "app.testing.query_budget"]
+
+
+@pytest.fixture(scope="session")
+def app_tables():
+    from app.db.database import async_engine
+    from app.db.warmup import create_tables
+
+    async def create():
+        await create_tables()
+        # The pool's connections belong to this event loop
+        await async_engine.dispose()
+
+    asyncio.run(create())
+
+
+@pytest.fixture
+def create_user(app_tables):
+    """
+    Adds a user (and their posts) to the app's database; returns the user
+    id and a bearer token for it.
+    """
+    from app.core.security import create_access_token
+    from app.db import crud, models
+    from app.db.database import AsyncSessionLocal, async_engine
+
+    def create(posts=(), **fields) -> tuple[int, str]:
+        async def insert():
+            async with AsyncSessionLocal() as db:
+                user = models.User(email=f"{uuid.uuid4().hex}@example.com", hashed_password="x", **fields)
+                db.add(user)
+                await db.commit()
+                if posts:
+                    await crud.create_posts_bulk(db, list(posts), user.id)
+            await async_engine.dispose()
+            return user.id
+
+        user_id = asyncio.run(insert())
+        return user_id, create_access_token({"sub": str(user_id)})
+
+    return create
+
+
+@pytest.fixture(autouse=True)
+def close_redis_breaker():
+    # Requests against the unreachable test Redis open the shared breaker;
+    # don't let that leak into the next test
+    yield
+    from app.core.circuit_breaker import CLOSED
+    from app.core.redis import redis_breaker
+
+    redis_breaker._set_state(CLOSED)
+    redis_breaker.failures = 0
+    redis_breaker._probe_in_flight = False
@@ -0,0 +1,93 @@
+import asyncio
+from datetime import timedelta
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from jose import JWTError
+
+from app.core import revocation
+from app.db.database import async_engine
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    decode_access_token,
+    decode_refresh_token,
+)
+from app.main import app
+
+
+def refresh_token_for(user_id: int) -> str:
+    return create_refresh_token({"sub": str(user_id)}, expires_delta=timedelta(days=7))
+
+
+def test_refresh_token_is_not_a_bearer_token():
+    response = TestClient(app).get("/me", headers={"Authorization": f"Bearer {refresh_token_for(1)}"})
+    assert response.status_code == 401
+
+
+def test_token_types_are_not_interchangeable():
+    access = create_access_token({"sub": "1"})
+    refresh = refresh_token_for(1)
+
+    assert decode_access_token(access)["sub"] == "1"
+    assert decode_refresh_token(refresh)["sub"] == "1"
+    with pytest.raises(JWTError):
+        decode_access_token(refresh)
+    with pytest.raises(JWTError):
+        decode_refresh_token(access)
+
+
+def test_inactive_user_is_rejected(create_user):
+    client = TestClient(app)
+    _, token = create_user(is_active=False)
+
+    # Twice: the second request finds the user in the in-process cache
+    for _ in range(2):
+        response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 401
+
+
+class FakeRevocationStore:
+    def __init__(self):
+        self.keys = set()
+
+    async def exists(self, key):
+        await asyncio.sleep(0)
+        return int(key in self.keys)
+
+    async def pipeline_execute(self, *commands):
+        # Yield first so concurrent requests interleave like real round-trips
+        await asyncio.sleep(0)
+        results = []
+        for name, *args in commands:
+            if name == "set":
+                key, nx = args[0], len(args) > 4 and args[4]
+                results.append(None if nx and key in self.keys else True)
+                self.keys.add(key)
+            else:
+                results.append(0)
+        return results
+
+
+def test_concurrent_refreshes_with_one_token_succeed_once(monkeypatch, create_user):
+    store = FakeRevocationStore()
+    monkeypatch.setattr(revocation, "async_redis_client", store)
+    monkeypatch.setattr(revocation, "pipeline_execute", store.pipeline_execute)
+    user_id, _ = create_user()
+    token = refresh_token_for(user_id)
+
+    async def replay():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*(
+                    client.post("/auth/refresh", params={"refresh_token": token})
+                    for _ in range(2)
+                ))
+        finally:
+            # Pooled aiosqlite connections would outlive this event loop
+            await async_engine.dispose()
+
+    responses = asyncio.run(replay())
+    assert sorted(r.status_code for r in responses) == [200, 401]
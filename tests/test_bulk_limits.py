@@ -0,0 +1,46 @@
+import asyncio
+
+import orjson
+import pytest
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from app.core.config import get_settings
+from app.db.schemas import PostBulkCreate, PostBulkDelete
+from app.main import validation_exception_handler
+
+MAX_ITEMS = get_settings().POST_BULK_MAX_ITEMS
+
+
+def body_errors(exc: ValidationError) -> list[dict]:
+    # What FastAPI hands the handler for a request body
+    return [{**error, "loc": ("body", *error["loc"])} for error in exc.errors()]
+
+
+@pytest.mark.parametrize("schema, payload", [
+    (PostBulkCreate, {"items": [{"title": "t", "content": "c"}] * (MAX_ITEMS + 1)}),
+    (PostBulkDelete, {"ids": list(range(MAX_ITEMS + 1))}),
+])
+def test_oversize_bulk_payload_is_a_413(schema, payload):
+    with pytest.raises(ValidationError) as exc:
+        schema.model_validate(payload)
+
+    response = asyncio.run(
+        validation_exception_handler(None, RequestValidationError(body_errors(exc.value)))
+    )
+    assert response.status_code == 413
+    assert orjson.loads(response.body)["error"] == f"At most {MAX_ITEMS} posts per request"
+
+
+def test_bulk_payload_at_the_cap_is_valid():
+    assert len(PostBulkDelete.model_validate({"ids": list(range(MAX_ITEMS))}).ids) == MAX_ITEMS
+
+
+def test_other_validation_errors_stay_422():
+    with pytest.raises(ValidationError) as exc:
+        PostBulkDelete.model_validate({"ids": []})
+
+    response = asyncio.run(
+        validation_exception_handler(None, RequestValidationError(body_errors(exc.value)))
+    )
+    assert response.status_code == 422
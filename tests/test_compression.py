@@ -0,0 +1,52 @@
+import asyncio
+import zlib
+
+import brotli
+import pytest
+
+from app.core.middleware import CompressionMiddleware
+
+
+def _app(chunks, headers):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+def _call(app, accept_encoding: bytes):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding)]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=10)(scope, None, send))
+    return messages
+
+
+DECOMPRESSORS = {
+    b"gzip": lambda: zlib.decompressobj(16 + zlib.MAX_WBITS).decompress,
+    b"br": lambda: brotli.Decompressor().process,
+}
+
+
+@pytest.mark.parametrize("encoding", [b"gzip", b"br"])
+def test_streamed_chunks_are_flushed_one_by_one(encoding):
+    events = [b"data: tick %d\n\n" % i for i in range(3)]
+    messages = _call(_app(events, [(b"content-type", b"text/event-stream")]), encoding)
+
+    start, *bodies = messages
+    assert (b"content-encoding", encoding) in start["headers"]
+    decompress = DECOMPRESSORS[encoding]()
+    # Every event is decodable as soon as its chunk arrives
+    for event, message in zip(events, bodies):
+        assert decompress(message["body"]) == event
+
+
+def test_existing_vary_is_merged():
+    headers = [(b"content-type", b"application/json"), (b"vary", b"Origin")]
+    messages = _call(_app([b"{}" * 100], headers), b"gzip")
+    vary = [value for key, value in messages[0]["headers"] if key == b"vary"]
+    assert vary == [b"Origin, Accept-Encoding"]
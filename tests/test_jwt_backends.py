@@ -0,0 +1,59 @@
+import base64
+import json
+import time
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from jose.exceptions import JWTError
+
+from app.core.jwt_backends import AsymmetricBackend, TokenBackend
+
+KEY = Ed25519PrivateKey.generate()
+
+
+@pytest.fixture
+def backend():
+    return AsymmetricBackend("EdDSA", {"k1": KEY.public_key()}, {"k1": KEY}, "k1")
+
+
+def _b64(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).rstrip(b"=").decode()
+
+
+def _signed(claims) -> str:
+    signing_input = f"{_b64({'alg': 'EdDSA', 'typ': 'JWT', 'kid': 'k1'})}.{_b64(claims)}"
+    signature = base64.urlsafe_b64encode(KEY.sign(signing_input.encode())).rstrip(b"=").decode()
+    return f"{signing_input}.{signature}"
+
+
+def test_round_trip(backend):
+    token = backend.encode({"sub": "1", "exp": time.time() + 60})
+    assert backend.decode(token)["sub"] == "1"
+
+
+@pytest.mark.parametrize("token", [
+    "not-a-token",
+    f"{_b64([])}.{_b64({})}.AA",
+    f"{_b64({'alg': 'EdDSA', 'kid': ['k1']})}.{_b64({})}.AA",
+    f"{_b64({'alg': 'EdDSA', 'kid': {'a': 1}})}.{_b64({})}.AA",
+])
+def test_malformed_header_is_jwt_error(backend, token):
+    with pytest.raises(JWTError):
+        backend.decode(token)
+
+
+@pytest.mark.parametrize("claims", [[1], "claims", {"exp": "tomorrow"}, {"exp": True}, {"exp": [1]}])
+def test_malformed_claims_are_jwt_error(backend, claims):
+    with pytest.raises(JWTError):
+        backend.decode(_signed(claims))
+
+
+def test_backend_must_implement_encode_and_decode():
+    class EncodeOnly(TokenBackend):
+        def encode(self, claims: dict) -> str:
+            return ""
+
+    with pytest.raises(TypeError):
+        TokenBackend()
+    with pytest.raises(TypeError):
+        EncodeOnly()
@@ -0,0 +1,41 @@
+import io
+import logging
+import queue
+import threading
+from logging.handlers import QueueListener
+
+from app.core.logger import NonBlockingQueueHandler, TextFormatter
+
+
+class ThreadRecordingArg:
+    def __init__(self):
+        self.formatted_on = []
+
+    def __str__(self):
+        self.formatted_on.append(threading.current_thread())
+        return "arg"
+
+
+def test_messages_are_formatted_on_the_listener_thread():
+    handler = NonBlockingQueueHandler(queue.SimpleQueue(), max_size=10)
+    output = io.StringIO()
+    sink = logging.StreamHandler(output)
+    sink.setFormatter(TextFormatter())
+    listener = QueueListener(handler.queue, sink)
+    listener.start()
+
+    arg = ThreadRecordingArg()
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "value=%s", (arg,), None)
+    handler.handle(record)
+    listener.stop()
+
+    assert "value=arg" in output.getvalue()
+    assert arg.formatted_on and threading.current_thread() not in arg.formatted_on
+
+
+def test_full_queue_drops_records():
+    handler = NonBlockingQueueHandler(queue.SimpleQueue(), max_size=1)
+    for _ in range(3):
+        handler.handle(logging.LogRecord("test", logging.INFO, __file__, 1, "msg", None, None))
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
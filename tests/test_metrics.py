@@ -0,0 +1,47 @@
+import asyncio
+
+import redis
+from prometheus_client import REGISTRY
+
+from app.core.bloom import RevokedTokenFilter
+from app.core.circuit_breaker import CircuitBreaker, fail_open
+from app.core.metrics import render_metrics
+
+
+def sample(metric: str, **labels) -> float | None:
+    return REGISTRY.get_sample_value(metric, labels)
+
+
+def test_breaker_state_and_counters_are_exported():
+    breaker = CircuitBreaker(name="metrics-test", failure_threshold=1, cooldown_seconds=60)
+    assert sample("circuit_breaker_state", name="metrics-test") == 0
+
+    async def down():
+        raise redis.ConnectionError("down")
+
+    async def scenario():
+        await breaker.call(down, fallback=fail_open(None))
+        await breaker.call(down, fallback=fail_open(None))
+
+    asyncio.run(scenario())
+    assert sample("circuit_breaker_state", name="metrics-test") == 2
+    assert sample("circuit_breaker_opened_total", name="metrics-test") == 1
+    assert sample("circuit_breaker_short_circuited_calls_total", name="metrics-test") == 1
+
+
+def test_revocation_filter_metrics_are_exported():
+    saved_before = sample("revocation_filter_round_trips_saved_total")
+    revoked = RevokedTokenFilter("revoked:", "revoked", capacity=100, error_rate=0.01, bucket_seconds=60)
+    revoked.ready = True
+    assert sample("revocation_filter_ready") == 1
+
+    for i in range(3):
+        assert not revoked.might_be_revoked(f"jti-{i}")
+    revoked.record_result(revoked=False)
+
+    assert sample("revocation_filter_round_trips_saved_total") == saved_before + 3
+    assert sample("revocation_filter_false_positive_rate") == 0.25
+
+    body, _ = render_metrics()
+    for name in (b"circuit_breaker_state", b"revocation_filter_false_positive_rate"):
+        assert name in body
@@ -0,0 +1,51 @@
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAD_TABLES = {"users", "posts", "refresh_tokens", "posts_fts", "alembic_version"}
+
+
+def alembic(db_path: str, *args: str):
+    # A subprocess: alembic.ini's logging config would replace the app's
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    result = subprocess.run(
+        [sys.executable, "-m", "alembic", *args], cwd=ROOT, env=env,
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+
+def tables(db_path: str) -> set[str]:
+    with sqlite3.connect(db_path) as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def columns(db_path: str, table: str) -> set[str]:
+    with sqlite3.connect(db_path) as conn:
+        return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_fresh_database_upgrades_and_downgrades(tmp_path):
+    db = str(tmp_path / "fresh.db")
+    alembic(db, "upgrade", "head")
+    assert HEAD_TABLES <= tables(db)
+    alembic(db, "downgrade", "base")
+    assert tables(db) == {"alembic_version"}
+
+
+@pytest.mark.parametrize("stamp", [None, "1128275cb44f"])
+def test_shipped_create_all_database_upgrades(tmp_path, stamp):
+    db = str(tmp_path / "shipped.db")
+    shutil.copy(os.path.join(ROOT, "fastapi.db"), db)
+    if stamp:
+        alembic(db, "stamp", stamp)
+
+    alembic(db, "upgrade", "head")
+    assert HEAD_TABLES <= tables(db)
+    assert "is_active" in columns(db, "users")
+    assert {"device", "is_revoked"} <= columns(db, "refresh_tokens")
@@ -0,0 +1,57 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.pagination import CURSOR_VALUE_TYPES, decode_cursor, encode_cursor
+from app.db import crud
+from app.main import app
+
+
+def raw_cursor(*parts) -> str:
+    return base64.urlsafe_b64encode(json.dumps(parts).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("sort, value", [("id", 42), ("title", "hello"), ("rank", -1.5)])
+def test_round_trip(sort, value):
+    assert decode_cursor(encode_cursor(sort, value, 7), sort) == (value, 7)
+
+
+def test_every_sortable_column_has_a_cursor_type():
+    assert set(crud.SORTABLE_POST_COLUMNS) <= set(CURSOR_VALUE_TYPES)
+
+
+@pytest.mark.parametrize("cursor, sort", [
+    ("not base64!", "id"),
+    (raw_cursor("id", 1), "id"),
+    (raw_cursor("title", "a", 1), "id"),
+    (raw_cursor("id", "a", 1), "id"),
+    (raw_cursor("id", True, 1), "id"),
+    (raw_cursor("title", 5, 1), "title"),
+    (raw_cursor("rank", "x", 1), "rank"),
+    (raw_cursor("id", 1, "x"), "id"),
+    (raw_cursor("id", 1, None), "id"),
+    (raw_cursor("id", 1, 1.5), "id"),
+    (raw_cursor("bogus", 1, 1), "bogus"),
+])
+def test_malformed_cursor_is_a_400(cursor, sort):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, sort)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("sort", ["id", "title", "content", "bogus"])
+@pytest.mark.query_budget(3, route="/posts/me")
+def test_cursor_from_page_one_fetches_page_two(create_user, sort):
+    _, token = create_user(posts=[(f"title {i:02d}", f"content {i}") for i in range(5)])
+    http = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+    first = http.get("/posts/me", params={"sort": sort, "limit": 3}).json()["data"]
+    cursor = first["meta"]["next_cursor"]
+    second = http.get("/posts/me", params={"sort": sort, "limit": 3, "after": cursor})
+
+    assert second.status_code == 200
+    ids = [post["id"] for post in first["items"] + second.json()["data"]["items"]]
+    assert len(ids) == len(set(ids)) == 5
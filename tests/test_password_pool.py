@@ -0,0 +1,32 @@
+import asyncio
+import os
+
+import pytest
+
+from app.core import security
+from app.core.exceptions import ServiceUnavailableException
+
+
+def _crash(_):
+    os._exit(1)
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    security.shutdown_password_pool()
+    yield
+    security.shutdown_password_pool()
+
+
+def test_pool_does_not_fork():
+    assert security._get_password_pool()._mp_context.get_start_method() in ("forkserver", "spawn")
+
+
+def test_broken_pool_is_a_503_and_rebuilt():
+    async def run():
+        with pytest.raises(ServiceUnavailableException):
+            await security._run_in_password_pool(_crash, None)
+        # The next call gets a new, working pool
+        return await security._run_in_password_pool(abs, -3)
+
+    assert asyncio.run(run()) == 3
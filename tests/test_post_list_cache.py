@@ -0,0 +1,96 @@
+import asyncio
+
+import redis
+
+from app.core import post_list_cache as module
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.post_list_cache import PostListCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise redis.ConnectionError("Redis is down")
+
+    async def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        self._check()
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+
+def use_fake_redis(monkeypatch) -> FakeRedis:
+    fake = FakeRedis()
+
+    async def pipeline_execute(*commands):
+        return [await getattr(fake, name)(*args) for name, *args in commands]
+
+    monkeypatch.setattr(module, "async_redis_client", fake)
+    monkeypatch.setattr(module, "pipeline_execute", pipeline_execute)
+    monkeypatch.setattr(module, "redis_breaker", CircuitBreaker(
+        name="post-list-cache-test", failure_threshold=5, cooldown_seconds=60,
+    ))
+    return fake
+
+
+def test_missing_version_is_seeded_once(monkeypatch):
+    fake = use_fake_redis(monkeypatch)
+    cache = PostListCache(ttl_seconds=60)
+
+    async def scenario():
+        first = await cache.lookup(1, {"limit": 10})
+        await cache.store(first, {"items": []})
+        second = await cache.lookup(1, {"limit": 10})
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.version == fake.data["posts:version:1"] != "0"
+    assert first.data is None
+    assert second.version == first.version
+    assert second.data == {"items": []}
+
+
+def test_evicted_version_does_not_revive_old_entries(monkeypatch):
+    fake = use_fake_redis(monkeypatch)
+    cache = PostListCache(ttl_seconds=60)
+
+    async def scenario():
+        cached = await cache.lookup(1, {"limit": 10})
+        await cache.store(cached, {"items": ["old"]})
+        del fake.data["posts:version:1"]
+        return await cache.lookup(1, {"limit": 10})
+
+    after_eviction = asyncio.run(scenario())
+    assert after_eviction.data is None
+
+
+def test_write_during_outage_is_not_hidden_after_recovery(monkeypatch):
+    fake = use_fake_redis(monkeypatch)
+    cache = PostListCache(ttl_seconds=60)
+
+    async def scenario():
+        cached = await cache.lookup(1, {"limit": 10})
+        await cache.store(cached, {"items": ["old"]})
+
+        fake.down = True
+        await cache.bump(1)
+        during = await cache.lookup(1, {"limit": 10})
+
+        fake.down = False
+        after = await cache.lookup(1, {"limit": 10})
+        return cached, during, after
+
+    cached, during, after = asyncio.run(scenario())
+    assert during is None
+    assert after.data is None
+    assert after.version != cached.version
+    assert cache.stats()["dirty_users"] == 0
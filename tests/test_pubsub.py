@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+import redis
+
+from app.core import pubsub as module
+from app.core.bloom import RevokedTokenFilter
+from app.core.pubsub import ChannelListener
+
+
+class FakePubSub:
+    def __init__(self, client):
+        self.client = client
+
+    def subscribe(self, **handlers):
+        self.client.attempts += 1
+        if self.client.attempts <= self.client.failures:
+            raise redis.ConnectionError("Redis is down")
+        self.client.handlers.update(handlers)
+
+    def get_message(self, timeout):
+        self.client.listening.set()
+        self.client.stopped.wait(timeout)
+
+    def close(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.attempts = 0
+        self.handlers = {}
+        self.listening = threading.Event()
+        self.stopped = threading.Event()
+
+    def pubsub(self, ignore_subscribe_messages):
+        return FakePubSub(self)
+
+
+def test_listener_retries_until_redis_is_up(monkeypatch):
+    client = FakeRedis(failures=2)
+    monkeypatch.setattr(module, "redis_client", client)
+    monkeypatch.setattr(module, "RETRY_FIRST_SECONDS", 0.01)
+    errors, subscribed = [], []
+
+    listener = ChannelListener(
+        "Test", "test:channel", print,
+        on_subscribed=lambda: subscribed.append(True),
+        on_error=lambda: errors.append(True),
+    )
+    listener.start()
+    try:
+        assert client.listening.wait(5)
+    finally:
+        client.stopped.set()
+        listener.stop()
+
+    assert client.attempts == 3
+    assert len(errors) == 2
+    assert subscribed == [True]
+    assert client.handlers == {"test:channel": print}
+
+
+def test_revocation_filter_not_ready_while_rebuild_fails(monkeypatch):
+    revoked = RevokedTokenFilter("revoked:", "revoked", capacity=100, error_rate=0.01, bucket_seconds=60)
+    revoked.ready = True
+
+    # conftest points REDIS_URL at a closed port
+    revoked._on_listener_error()
+    with pytest.raises(redis.ConnectionError):
+        revoked.rebuild()
+    assert not revoked.ready
+    assert revoked.might_be_revoked("any")
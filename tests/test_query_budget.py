@@ -0,0 +1,95 @@
+import pytest
+
+from app.core.query_profiler import normalize_statement
+
+# Reports one request to the profiler, as the app's middleware does
+REQUEST_HELPER = """
+import types
+
+import pytest
+
+from app.core.metrics import RequestStats
+from app.core.query_profiler import query_profiler
+
+
+def request(route, queries, method="GET"):
+    scope = {"method": method, "route": types.SimpleNamespace(path=route)}
+    statements = [f"SELECT * FROM posts WHERE id = {i}" for i in range(queries)]
+    stats = RequestStats(started_ns=0, db_queries=queries, statements=statements)
+    query_profiler.finish(scope, 200, stats)
+"""
+
+
+def run_budgets(pytester, tests: str, ini: str = ""):
+    if ini:
+        pytester.makeini(f"[pytest]\n{ini}")
+    pytester.makepyfile(REQUEST_HELPER + tests)
+    return pytester.runpytest("-p", "app.testing.query_budget")
+
+
+def test_requests_within_budget_pass(pytester):
+    result = run_budgets(pytester, """
+@pytest.mark.query_budget(3)
+def test_within():
+    request("/posts/me", 3)
+
+def test_unbudgeted():
+    request("/posts/me", 50)
+""")
+    result.assert_outcomes(passed=2)
+
+
+def test_request_over_budget_fails_with_its_statements(pytester):
+    result = run_budgets(pytester, """
+@pytest.mark.query_budget(2, route="/posts/me")
+def test_over():
+    request("/posts/me", 3)
+    request("/posts/{post_id}", 3)
+""")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines([
+        "Query budget exceeded:",
+        "GET /posts/me: 3 queries (budget 2)",
+        "    3 x SELECT * FROM posts WHERE id = ?*",
+    ])
+    result.stdout.no_fnmatch_line("GET /posts/{post_id}*")
+
+
+def test_ini_budgets_apply_per_route_with_a_default(pytester):
+    result = run_budgets(pytester, """
+def test_route_budget():
+    request("/posts/me", 2)
+
+def test_default_budget():
+    request("/posts/search", 4)
+
+@pytest.mark.query_budget(5)
+def test_marker_overrides_ini():
+    request("/posts/me", 5)
+""", ini="query_budgets =\n    GET /posts/me 1\nquery_budget_default = 3\n")
+    result.assert_outcomes(passed=1, failed=2)
+    result.stdout.fnmatch_lines([
+        "*GET /posts/me: 2 queries (budget 1)",
+        "*GET /posts/search: 4 queries (budget 3)",
+    ])
+
+
+def test_malformed_ini_budget_is_a_usage_error(pytester):
+    result = run_budgets(pytester, "", ini="query_budgets =\n    /posts/me 1\n")
+    result.stderr.fnmatch_lines(["*query_budgets: expected 'METHOD /route max_queries'*"])
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+
+
+@pytest.mark.parametrize("statement, normalized", [
+    ("SELECT * FROM posts WHERE id = 42", "SELECT * FROM posts WHERE id = ?"),
+    ("SELECT * FROM users WHERE email = 'a@b.c' AND name = 'O''Brien'",
+     "SELECT * FROM users WHERE email = ? AND name = ?"),
+    ("SELECT * FROM posts WHERE owner_id = $1 AND id < %(id_1)s AND title = :title",
+     "SELECT * FROM posts WHERE owner_id = ? AND id < ? AND title = ?"),
+    ("DELETE FROM posts WHERE id IN (?, ?, ?)", "DELETE FROM posts WHERE id IN (?)"),
+    ("DELETE FROM posts WHERE id IN (1, 2)", "DELETE FROM posts WHERE id IN (?)"),
+    ("SELECT\n    posts.id\nFROM   posts", "SELECT posts.id FROM posts"),
+    ("SELECT CAST(x AS TEXT)::text FROM t2", "SELECT CAST(x AS TEXT)::text FROM t2"),
+])
+def test_normalize_statement(statement, normalized):
+    assert normalize_statement(statement) == normalized
@@ -0,0 +1,82 @@
+"""
+EXPLAIN QUERY PLAN audit of the hot post/token queries: every statement the
+crud functions emit must be served by an index, never by a full table scan
+or a temp B-tree sort.
+"""
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import crud, models
+from app.db.database import Base
+
+# Keyset positions of the right type for each sort column
+AFTER = {"id": (50, 50), "title": ("t", 50)}
+
+
+def _unindexed_steps(plan: list[str]) -> list[str]:
+    # "SCAN posts" is a full table scan and a temp B-tree means the ORDER BY
+    # is not index-backed; "SEARCH ... USING INDEX" is fine
+    return [
+        step for step in plan
+        if step.startswith("SCAN") and "USING" not in step and "SUBQUERY" not in step
+        or "TEMP B-TREE" in step
+    ]
+
+
+async def _plans(db_url: str, run_queries) -> list[tuple[str, list[str]]]:
+    engine = create_async_engine(db_url)
+    statements = []
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        await run_queries(db)
+    event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append((statement, [row[-1] for row in result]))
+    await engine.dispose()
+    return plans
+
+
+def _assert_indexed(tmp_path, run_queries):
+    plans = asyncio.run(_plans(f"sqlite+aiosqlite:///{os.path.join(tmp_path, 'plans.db')}", run_queries))
+    assert plans
+    for statement, plan in plans:
+        assert not _unindexed_steps(plan), f"{' '.join(statement.split())}\n{plan}"
+
+
+def test_every_sortable_column_has_a_keyset_cursor_fixture():
+    assert set(AFTER) == set(crud.SORTABLE_POST_COLUMNS)
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("sort", crud.SORTABLE_POST_COLUMNS)
+def test_post_pages_use_an_index(tmp_path, sort, order):
+    async def run_queries(db):
+        await crud.get_posts_by_user_paginated(db, user_id=1, page=3, limit=10, sort=sort, order=order)
+        await crud.get_posts_by_user_keyset(
+            db, user_id=1, limit=10, after=AFTER[sort], sort=sort, order=order, include_total=True
+        )
+
+    _assert_indexed(tmp_path, run_queries)
+
+
+def test_owner_lookups_use_an_index(tmp_path):
+    async def run_queries(db):
+        await crud.get_posts_by_user(db, user_id=1)
+        await db.execute(select(models.RefreshToken).where(models.RefreshToken.user_id == 1))
+
+    _assert_indexed(tmp_path, run_queries)
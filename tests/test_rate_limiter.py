@@ -0,0 +1,93 @@
+import asyncio
+import math
+
+import pytest
+
+from app.core import rate_limiter as module
+from app.core.rate_limiter import LeasedLimiter, RateLimitPolicy
+
+POLICY = RateLimitPolicy(
+    name="test", limit=60, window_seconds=60, scope="user",
+    lease_size=5, max_overshoot=5, lease_ttl_seconds=1.0,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeBucket:
+    """TOKEN_BUCKET_LEASE_LUA in Python, on the fake clock."""
+
+    def __init__(self, clock: FakeClock):
+        self.clock = clock
+        self.state = {}
+
+    async def __call__(self, keys, args):
+        capacity, rate, requested, overshoot, _ttl, returned = args
+        now = self.clock.now * 1000
+        tokens, ts = self.state.get(keys[0], (capacity, now))
+        tokens = min(capacity, tokens + (now - ts) * rate + returned)
+
+        granted = 0
+        if tokens - requested >= -overshoot:
+            granted = requested
+        elif tokens >= 1:
+            granted = math.floor(tokens)
+        tokens -= granted
+        self.state[keys[0]] = (tokens, now)
+
+        wait = math.ceil((1 - tokens) / rate) if tokens < 1 else 0
+        return [granted, math.floor(tokens), wait]
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(module, "time", clock)
+    monkeypatch.setattr(module, "_token_bucket_lease", FakeBucket(clock))
+    return LeasedLimiter(), clock
+
+
+def run_requests(limiter, clock, count: int, interval: float) -> int:
+    async def main():
+        rejected = 0
+        for _ in range(count):
+            result = await limiter.hit(POLICY, "user:1")
+            rejected += not result.allowed
+            clock.now += interval
+        return rejected
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("per_minute", [54.5, 59.0, 30.0])
+def test_client_under_the_limit_is_never_rejected(limiter, per_minute):
+    leased, clock = limiter
+    assert run_requests(leased, clock, 300, 60 / per_minute) == 0
+
+
+def test_client_over_the_limit_is_held_to_it(limiter):
+    leased, clock = limiter
+    rejected = run_requests(leased, clock, 600, 0.05)  # 1200/min for 30s
+    allowed = 600 - rejected
+    # Burst capacity plus 30s of refill, plus at most max_overshoot
+    assert 60 + 30 <= allowed <= 60 + 30 + POLICY.max_overshoot + POLICY.lease_size
+
+
+def test_evicted_lease_gives_its_tokens_back(limiter):
+    leased, clock = limiter
+    leased.max_keys = 1
+    bucket = module._token_bucket_lease
+
+    async def main():
+        await leased.hit(POLICY, "user:1")  # leases 5, uses 1
+        await leased.hit(POLICY, "user:2")  # evicts user:1
+        await asyncio.gather(*leased._returns)
+
+    asyncio.run(main())
+    assert bucket.state["rate_limit:bucket:test:user:1"][0] == 59
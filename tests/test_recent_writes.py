@@ -0,0 +1,33 @@
+import asyncio
+
+from app.core import recent_writes as module
+from app.core.recent_writes import RecentWrites
+
+
+def test_disabled_without_replica_skips_redis(monkeypatch):
+    published = []
+
+    async def publish(*args):
+        published.append(args)
+
+    monkeypatch.setattr(module.async_redis_client, "publish", publish)
+    tracker = RecentWrites(window_seconds=5, enabled=False)
+
+    asyncio.run(tracker.mark(1))
+    assert published == []
+    assert tracker.reads_from_primary(1)
+
+
+def test_enabled_routes_recent_writers_to_primary(monkeypatch):
+    published = []
+
+    async def publish(*args):
+        published.append(args)
+
+    monkeypatch.setattr(module.async_redis_client, "publish", publish)
+    tracker = RecentWrites(window_seconds=5, enabled=True)
+
+    asyncio.run(tracker.mark(1))
+    assert published == [(module.WRITES_CHANNEL, 1)]
+    assert tracker.reads_from_primary(1)
+    assert not tracker.reads_from_primary(2)
@@ -0,0 +1,60 @@
+import asyncio
+import os
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import crud, models
+from app.db.database import Base
+
+
+def run_search(tmp_path, scenario):
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp_path, 'search.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                db.add_all([models.User(id=1, email="a@example.com", hashed_password="x"),
+                            models.User(id=2, email="b@example.com", hashed_password="x")])
+                await db.commit()
+                await crud.create_posts_bulk(db, [("shared words", "mine"), ("2 apples", "x")], 1)
+                await crud.create_posts_bulk(db, [("shared words", "theirs")], 2)
+                return await scenario(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def titles(hits) -> list[str]:
+    return [post.title for post, _ in hits]
+
+
+def test_search_only_matches_own_posts(tmp_path):
+    async def scenario(db):
+        hits, _ = await crud.search_posts(db, user_id=1, query="shared", limit=10)
+        return [post.content for post, _ in hits]
+
+    assert run_search(tmp_path, scenario) == ["mine"]
+
+
+def test_owner_id_is_not_a_search_term(tmp_path):
+    async def scenario(db):
+        # "2" is user 2's owner_id; only the title containing it may match
+        hits, _ = await crud.search_posts(db, user_id=2, query="2", limit=10)
+        own, _ = await crud.search_posts(db, user_id=1, query="2", limit=10)
+        return titles(hits), titles(own)
+
+    assert run_search(tmp_path, scenario) == ([], ["2 apples"])
+
+
+def test_owner_change_moves_the_post_between_indexes(tmp_path):
+    async def scenario(db):
+        await db.execute(update(models.Post).where(models.Post.content == "theirs").values(owner_id=1))
+        await db.commit()
+        first, _ = await crud.search_posts(db, user_id=1, query="shared", limit=10)
+        second, _ = await crud.search_posts(db, user_id=2, query="shared", limit=10)
+        return len(first), len(second)
+
+    assert run_search(tmp_path, scenario) == (2, 0)
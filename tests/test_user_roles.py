@@ -0,0 +1,65 @@
+import asyncio
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.deps import get_current_user
+from app.core.user_cache import user_cache
+from app.db import models
+from app.db.database import Base, get_db
+from app.main import app
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp_path, 'roles.db')}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with sessions() as db:
+            db.add_all([models.User(id=1, email="admin@example.com", hashed_password="x", role="admin"),
+                        models.User(id=2, email="user@example.com", hashed_password="x", role="user")])
+            await db.commit()
+
+    asyncio.run(setup())
+    current = {"role": "admin"}
+
+    async def override_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_current_user] = lambda: models.User(id=1, email="admin@example.com", role=current["role"])
+    try:
+        yield TestClient(app), current
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(engine.dispose())
+
+
+def test_admin_changes_role_and_cache_is_invalidated(client, monkeypatch):
+    http, _ = client
+    invalidated = []
+
+    async def invalidate(user_id):
+        invalidated.append(user_id)
+
+    monkeypatch.setattr(user_cache, "invalidate", invalidate)
+    response = http.patch("/users/admin/2/role", json={"role": "admin"})
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {"id": 2, "email": "user@example.com", "role": "admin"}
+    assert invalidated == [2]
+
+
+def test_role_change_rejects_unknown_user_role_and_non_admins(client):
+    http, current = client
+    assert http.patch("/users/admin/99/role", json={"role": "admin"}).status_code == 404
+    assert http.patch("/users/admin/2/role", json={"role": "root"}).status_code == 422
+
+    current["role"] = "user"
+    assert http.patch("/users/admin/2/role", json={"role": "admin"}).status_code == 403